@@ -4,26 +4,41 @@ from src.mlproject.components.data_ingestion import DataIngestion
 from src.mlproject.components.data_ingestion import DataIngestionConfig
 from src.mlproject.components.data_transformation import DataTransformationConfig,DataTransformation
 from src.mlproject.components.model_tranier import ModelTrainerConfig,ModelTrainer
+from src.mlproject.profiling import enable_training_profiler,profile_stage
 
+import os
 import sys
+import argparse
+from datetime import datetime
 
 
 if __name__=="__main__":
+    parser=argparse.ArgumentParser()
+    parser.add_argument("--profile",nargs="?",const=os.path.join("profiles",datetime.now().strftime('%m_%d_%Y_%H_%M_%S')),
+                        help="record per-stage cProfile and tracemalloc reports into this directory")
+    args=parser.parse_args()
+
+    if args.profile:
+        enable_training_profiler(args.profile)
+
     logging.info("The execution has started")
 
     try:
         #data_ingestion_config=DataIngestionConfig()
-        data_ingestion=DataIngestion()
-        train_data_path,test_data_path=data_ingestion.initiate_data_ingestion()
+        with profile_stage("data_ingestion"):
+            data_ingestion=DataIngestion()
+            train_data_path,test_data_path=data_ingestion.initiate_data_ingestion()
 
         #data_transformation_config=DataTransformationConfig()
-        data_transformation=DataTransformation()
-        train_arr,test_arr,_=data_transformation.initiate_data_transformation(train_data_path,test_data_path)
+        with profile_stage("data_transformation"):
+            data_transformation=DataTransformation()
+            X_train,targets_train,X_test,targets_test,preprocessor_path=data_transformation.initiate_multi_target_data_transformation(train_data_path,test_data_path)
 
         ## Model Training
 
-        model_trainer=ModelTrainer()
-        print(model_trainer.initiate_model_trainer(train_arr,test_arr))
+        with profile_stage("model_training"):
+            model_trainer=ModelTrainer()
+            print(model_trainer.initiate_multi_target_model_trainer(X_train,targets_train,X_test,targets_test,preprocessor_path))
         
     except Exception as e:
         logging.info("Custom Exception")
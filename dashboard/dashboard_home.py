@@ -3,6 +3,11 @@ import pandas as pd
 import plotly.express as px
 import pickle
 import os
+import sys
+
+# The model artifact references src.mlproject classes; make them importable from the dashboard
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from src.mlproject.schema import TARGET_COLUMN, SchemaValidationError, decode_frame
 
 # Set page config
 st.set_page_config(page_title="Smart Construction Dashboard", layout="wide", initial_sidebar_state="expanded")
@@ -20,7 +25,8 @@ def load_model(path):
     with open(path, "rb") as file:
         return pickle.load(file)
 
-model_path = os.path.join("..", "artifacts", "model.pkl")
+# Bundles the preprocessor with the models, so it takes schema-decoded rows directly
+model_path = os.path.join("..", "artifacts", "multi_target_model.pkl")
 model = load_model(model_path) if os.path.exists(model_path) else None
 if not model:
     st.warning("Model not found. Please train your model first.")
@@ -89,7 +95,10 @@ if menu == "AI Recommendations":
         st.write("### Selected Features:")
         st.dataframe(features.to_frame().T)
 
-        prediction = model.predict([features])[0]
-        st.success(f"✅ Predicted Resource Allocation Efficiency: **{prediction:.2f}%**")
+        try:
+            prediction = model.predict(decode_frame(features))[TARGET_COLUMN][0]
+            st.success(f"✅ Predicted Resource Allocation Efficiency: **{prediction:.2f}%**")
+        except SchemaValidationError as e:
+            st.error(f"Selected row does not match the model's input schema: {e}")
     else:
         st.error("Model not available for prediction.")
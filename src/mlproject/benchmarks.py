@@ -0,0 +1,343 @@
+import os
+import sys
+import time
+import argparse
+import tempfile
+import multiprocessing
+
+import numpy as np
+import pandas as pd
+
+from src.mlproject.exception import CustomException
+
+
+def _peak_rss_mb():
+    # ru_maxrss is reported in KiB on Linux and in bytes on macOS
+    import resource
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def make_synthetic_dataset(n_rows, seed=42):
+    '''
+    Random dataset with the same columns as notebook/data/raw.csv, with
+    every feature inside its schema bounds.
+    '''
+    from src.mlproject.schema import FEATURES, FEATURE_COLUMNS, NUMERICAL_INDICES, TARGET_COLUMN
+
+    rng = np.random.default_rng(seed)
+    features = np.empty((n_rows, len(FEATURES)))
+    for col, feature in enumerate(FEATURES):
+        # Unbounded features get a unit (or 0..100 integer) range
+        high = feature.high if np.isfinite(feature.high) else (100 if feature.integer else 1)
+        if feature.integer:
+            features[:, col] = rng.integers(feature.low, high, size=n_rows, endpoint=True)
+        else:
+            features[:, col] = rng.uniform(feature.low, high, size=n_rows)
+    df = pd.DataFrame(features, columns=FEATURE_COLUMNS)
+    numerical = features[:, NUMERICAL_INDICES]
+    df[TARGET_COLUMN] = numerical @ rng.normal(size=numerical.shape[1]) + rng.normal(size=n_rows)
+    return df
+
+
+MEMORY_BENCHMARK_MODELS = ("Decision Tree", "Random Forest", "Linear Regression")
+
+
+def _training_memory_run(mode, train_path, test_path, work_dir, result_queue, model_names=MEMORY_BENCHMARK_MODELS):
+    from sklearn.linear_model import LinearRegression
+    from sklearn.tree import DecisionTreeRegressor
+    from sklearn.ensemble import RandomForestRegressor
+    from src.mlproject.components.data_transformation import DataTransformation, DataTransformationConfig
+    from src.mlproject.utlis import evaluate_models
+
+    baseline_mb = _peak_rss_mb()
+
+    data_transformation = DataTransformation(DataTransformationConfig(
+        preprocessor_obj_file_path=os.path.join(work_dir, f"preprocessor_{mode}.pkl")
+    ))
+
+    if mode == "before":
+        train_arr, test_arr, _ = data_transformation.initiate_data_transformation(train_path, test_path)
+        X_train, y_train = train_arr[:, :-1], train_arr[:, -1]
+        X_test, y_test = test_arr[:, :-1], test_arr[:, -1]
+        float32_models = ()
+    else:
+        X_train, y_train, X_test, y_test, _ = data_transformation.initiate_compact_data_transformation(
+            train_path, test_path
+        )
+        float32_models = ("Decision Tree", "Random Forest")
+
+    models = {
+        "Decision Tree": DecisionTreeRegressor(max_depth=8),
+        "Random Forest": RandomForestRegressor(n_estimators=10, max_depth=8),
+        "Linear Regression": LinearRegression(),
+    }
+    models = {name: models[name] for name in model_names}
+    params = {name: {} for name in models}
+    evaluate_models(X_train, y_train, X_test, y_test, models, params, float32_models=float32_models)
+
+    result_queue.put((baseline_mb, _peak_rss_mb(), X_train.dtype.str, X_train.flags.c_contiguous))
+
+
+def benchmark_training_memory(n_rows=1_000_000, model_names=MEMORY_BENCHMARK_MODELS):
+    '''
+    Peak RSS of data transformation + model evaluation on a synthetic dataset,
+    for the concatenated float64 path ("before") and the compact float32 path
+    ("after"). Each mode runs in a fresh process so the peaks do not mix.
+    model_names picks a subset of MEMORY_BENCHMARK_MODELS for quicker runs.
+    '''
+    try:
+        ctx = multiprocessing.get_context("spawn")
+        results = {}
+
+        with tempfile.TemporaryDirectory() as work_dir:
+            df = make_synthetic_dataset(n_rows)
+            split = int(n_rows * 0.8)
+            train_path = os.path.join(work_dir, "train.csv")
+            test_path = os.path.join(work_dir, "test.csv")
+            df.iloc[:split].to_csv(train_path, index=False)
+            df.iloc[split:].to_csv(test_path, index=False)
+            del df
+
+            for mode in ("before", "after"):
+                result_queue = ctx.Queue()
+                process = ctx.Process(
+                    target=_training_memory_run,
+                    args=(mode, train_path, test_path, work_dir, result_queue, model_names),
+                )
+                process.start()
+                baseline_mb, peak_mb, X_train_dtype, X_train_c_contiguous = result_queue.get()
+                process.join()
+                results[mode] = {
+                    "baseline_mb": baseline_mb,
+                    "peak_mb": peak_mb,
+                    "X_train_dtype": X_train_dtype,
+                    "X_train_c_contiguous": X_train_c_contiguous,
+                }
+
+        return results
+
+    except Exception as e:
+        raise CustomException(e, sys)
+
+
+def _time_per_call_ms(fn, repeats):
+    fn()
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    return (time.perf_counter() - start) * 1000 / repeats
+
+
+def benchmark_multi_target_latency(model_path=os.path.join("artifacts", "multi_target_model.pkl"),
+                                   batch_sizes=(1, 100, 10_000), repeats=200):
+    '''
+    Per-call latency of the combined artifact (one preprocessing pass feeding
+    both models) against two independent preprocessor+model pipelines.
+    '''
+    try:
+        import pickle
+        from src.mlproject.utlis import load_object
+        from src.mlproject.schema import decode_frame, preprocessor_input
+        from src.mlproject.concurrency import predict_limited
+
+        multi_target_model = load_object(file_path=model_path)
+        # Independent pipelines each own a separate copy of the preprocessor
+        independent = [
+            (pickle.loads(pickle.dumps(multi_target_model.preprocessor)), target, model)
+            for target, model in multi_target_model.models.items()
+        ]
+
+        def run_independent(features):
+            predictions = {}
+            for preprocessor, target, model in independent:
+                data_scaled = preprocessor.transform(preprocessor_input(preprocessor, features))
+                if target in multi_target_model.float32_targets:
+                    data_scaled = data_scaled.astype(np.float32)
+                predictions[target] = predict_limited(model, data_scaled)
+            return predictions
+
+        df = make_synthetic_dataset(max(batch_sizes))
+        results = {}
+        for batch_size in batch_sizes:
+            features = decode_frame(df.iloc[:batch_size])
+            n = max(1, repeats * 100 // max(batch_size, 100))
+            results[batch_size] = {
+                "combined_ms": _time_per_call_ms(lambda: multi_target_model.predict(features), n),
+                "independent_ms": _time_per_call_ms(lambda: run_independent(features), n),
+            }
+
+        return results
+
+    except Exception as e:
+        raise CustomException(e, sys)
+
+
+def benchmark_request_logging(n_requests=500):
+    '''
+    Latency of POST / on yapp.py with the async logging pipeline on vs. all
+    logging disabled. Needs the trained artifacts in the working directory;
+    predictions go to a throwaway database.
+    '''
+    try:
+        import logging
+        import yapp
+        from src.mlproject.components.prediction_store import PredictionStoreConfig
+        from src.mlproject.schema import FEATURE_COLUMNS, FORM_FIELDS
+
+        form = make_synthetic_dataset(1).iloc[0]
+        form_data = {field: form[column] for field, column in zip(FORM_FIELDS, FEATURE_COLUMNS)}
+
+        with tempfile.TemporaryDirectory() as work_dir:
+            client = yapp.create_app(PredictionStoreConfig(db_path=os.path.join(work_dir, "predictions.db"))).test_client()
+
+            def request_latencies_ms():
+                latencies = []
+                client.post("/", data=form_data)
+                for _ in range(n_requests):
+                    start = time.perf_counter()
+                    client.post("/", data=form_data)
+                    latencies.append((time.perf_counter() - start) * 1000)
+                return np.array(latencies)
+
+            results = {}
+            for mode in ("off", "on"):
+                logging.disable(logging.CRITICAL if mode == "off" else logging.NOTSET)
+                latencies = request_latencies_ms()
+                results[mode] = {"mean_ms": latencies.mean(), "p99_ms": np.percentile(latencies, 99)}
+            logging.disable(logging.NOTSET)
+            yapp.prediction_store.stop()
+
+        return results
+
+    except Exception as e:
+        raise CustomException(e, sys)
+
+
+def benchmark_prediction_store(n_records=100_000):
+    '''
+    Enqueue cost seen by a request thread and sustained write throughput of
+    the background writer, on a throwaway database.
+    '''
+    try:
+        from src.mlproject.components.prediction_store import PredictionStore, PredictionStoreConfig
+
+        df = make_synthetic_dataset(1000)
+        rows = df.to_dict(orient="records")
+
+        with tempfile.TemporaryDirectory() as work_dir:
+            store = PredictionStore(PredictionStoreConfig(db_path=os.path.join(work_dir, "predictions.db"))).start()
+
+            start = time.perf_counter()
+            for i in range(n_records):
+                row = rows[i % len(rows)]
+                store.record(row, row["Resource Allocation Efficiency"], row["Risk Level"], model_version="bench")
+            enqueue_seconds = time.perf_counter() - start
+
+            store.stop()
+            total_seconds = time.perf_counter() - start
+
+            stored = store.aggregates(model_version="bench")
+
+        return {
+            "records": n_records,
+            "stored": sum(bucket["count"] for bucket in stored),
+            "enqueue_us": enqueue_seconds * 1e6 / n_records,
+            "records_per_sec": n_records / total_seconds,
+        }
+
+    except Exception as e:
+        raise CustomException(e, sys)
+
+
+def benchmark_request_decoding(batch_sizes=(1, 100, 10_000), repeats=2000):
+    '''
+    Per-call cost of turning request input into model input: the previous
+    dict-of-lists -> DataFrame construction against the schema decoders
+    writing into a preallocated buffer, for form fields and CSV text.
+    '''
+    try:
+        import io
+        from src.mlproject.schema import FEATURE_COLUMNS, FORM_FIELDS, decode_records, decode_csv
+
+        df = make_synthetic_dataset(max(batch_sizes))[FEATURE_COLUMNS]
+        results = {}
+        for batch_size in batch_sizes:
+            rows = df.iloc[:batch_size]
+            # Form values arrive as strings, as they do from request.form
+            forms = [dict(zip(FORM_FIELDS, map(str, row))) for row in rows.itertuples(index=False)]
+            csv_text = rows.to_csv(index=False)
+            buffer = np.empty((batch_size, len(FEATURE_COLUMNS)))
+
+            def dataframe_records():
+                return pd.DataFrame({
+                    column: [float(form[field]) for form in forms]
+                    for field, column in zip(FORM_FIELDS, FEATURE_COLUMNS)
+                })
+
+            n = max(1, repeats // batch_size)
+            results[batch_size] = {
+                "dataframe_records_us": _time_per_call_ms(dataframe_records, n) * 1000,
+                "decode_records_us": _time_per_call_ms(lambda: decode_records(forms, out=buffer), n) * 1000,
+                "dataframe_csv_us": _time_per_call_ms(lambda: pd.read_csv(io.StringIO(csv_text)), n) * 1000,
+                "decode_csv_us": _time_per_call_ms(lambda: decode_csv(csv_text), n) * 1000,
+            }
+
+        return results
+
+    except Exception as e:
+        raise CustomException(e, sys)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Performance benchmarks for the ML pipeline")
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+
+    memory_parser = subparsers.add_parser("memory", help="peak RSS during training, before vs. after compact arrays")
+    memory_parser.add_argument("--rows", type=int, default=1_000_000)
+
+    multi_target_parser = subparsers.add_parser(
+        "multi-target", help="combined efficiency+risk latency vs. two independent pipelines")
+    multi_target_parser.add_argument("--model", default=os.path.join("artifacts", "multi_target_model.pkl"))
+    multi_target_parser.add_argument("--repeats", type=int, default=200)
+
+    logging_parser = subparsers.add_parser("logging", help="yapp request latency with logging on vs. off")
+    logging_parser.add_argument("--requests", type=int, default=500)
+
+    store_parser = subparsers.add_parser("prediction-store", help="prediction store enqueue cost and write throughput")
+    store_parser.add_argument("--records", type=int, default=100_000)
+
+    schema_parser = subparsers.add_parser("schema", help="request decoding cost, DataFrame construction vs. schema decoders")
+    schema_parser.add_argument("--repeats", type=int, default=2000)
+
+    args = parser.parse_args()
+
+    if args.benchmark == "memory":
+        results = benchmark_training_memory(args.rows)
+        for mode, result in results.items():
+            print(f"{mode:>6}: peak RSS {result['peak_mb']:8.1f} MB "
+                  f"(import baseline {result['baseline_mb']:.1f} MB)")
+
+    elif args.benchmark == "multi-target":
+        results = benchmark_multi_target_latency(args.model, repeats=args.repeats)
+        for batch_size, result in results.items():
+            print(f"batch {batch_size:>6}: combined {result['combined_ms']:8.3f} ms, "
+                  f"independent {result['independent_ms']:8.3f} ms")
+
+    elif args.benchmark == "logging":
+        results = benchmark_request_logging(args.requests)
+        for mode, result in results.items():
+            print(f"logging {mode:>3}: mean {result['mean_ms']:.3f} ms, p99 {result['p99_ms']:.3f} ms")
+
+    elif args.benchmark == "prediction-store":
+        result = benchmark_prediction_store(args.records)
+        print(f"{result['stored']}/{result['records']} records stored, "
+              f"{result['enqueue_us']:.2f} us per enqueue, {result['records_per_sec']:,.0f} records/sec sustained")
+
+    elif args.benchmark == "schema":
+        results = benchmark_request_decoding(repeats=args.repeats)
+        for batch_size, result in results.items():
+            print(f"batch {batch_size:>6}: records DataFrame {result['dataframe_records_us']:10.1f} us, "
+                  f"decoder {result['decode_records_us']:10.1f} us | "
+                  f"CSV DataFrame {result['dataframe_csv_us']:10.1f} us, decoder {result['decode_csv_us']:10.1f} us")
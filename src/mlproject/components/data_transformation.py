@@ -1,4 +1,5 @@
 import sys
+import os
 from dataclasses import dataclass
 
 import numpy as np
@@ -11,43 +12,31 @@ from sklearn.pipeline import Pipeline
 from src.mlproject.utlis import save_object
 from src.mlproject.exception import CustomException
 from src.mlproject.logger import logging
-import os
+from src.mlproject.schema import (
+    NUMERICAL_COLUMNS,
+    NUMERICAL_INDICES,
+    FEATURES_BY_NAME,
+    TARGET_COLUMN,
+    RISK_TARGET_COLUMN,
+    decode_frame,
+)
+
 
 @dataclass
 class DataTransformationConfig:
-    preprocessor_obj_file_path = os.path.join('artifacts', 'preprocessor.pkl')
-
-import sys
-import pandas as pd
-import numpy as np
-import pickle
-from sklearn.pipeline import Pipeline
-from sklearn.preprocessing import StandardScaler
-from sklearn.impute import SimpleImputer
-from sklearn.compose import ColumnTransformer
-
-from src.mlproject.logger import logging
-from src.mlproject.exception import CustomException
-from src.mlproject.utils import save_object
-from src.mlproject.components.data_transformation import DataTransformationConfig
+    preprocessor_obj_file_path: str = os.path.join('artifacts', 'preprocessor.pkl')
 
 
 class DataTransformation:
-    def __init__(self):
-        self.data_transformation_config = DataTransformationConfig()
+    def __init__(self, config: DataTransformationConfig = None):
+        self.data_transformation_config = config or DataTransformationConfig()
 
     def get_data_transformer_object(self):
         '''
         This function is responsible for creating the preprocessing pipeline.
         '''
         try:
-            # ✅ "Risk Level" is removed from the list below
-            numerical_columns = [
-                "Labor Requirements", "Equipment Usage", "Material Quantities", 
-                "Project Duration (days)", "Schedule Optimization", 
-                "Computation Time (CT)", "Best Cost (BC)", "Evaluation Metric (Nfe)", 
-                "Mean Resource Demand", "SD of Resource Demand"
-            ]
+            numerical_columns = NUMERICAL_COLUMNS
 
             num_pipeline = Pipeline(steps=[
                 ("imputer", SimpleImputer(strategy='median')),
@@ -56,9 +45,11 @@ class DataTransformation:
 
             logging.info(f"Numerical Columns for transformation: {numerical_columns}")
 
+            # Fitted on canonical-order arrays from schema.decode_*, so serving
+            # never has to build a DataFrame
             preprocessor = ColumnTransformer(
                 transformers=[
-                    ("num_pipeline", num_pipeline, numerical_columns)
+                    ("num_pipeline", num_pipeline, NUMERICAL_INDICES)
                 ]
             )
 
@@ -67,43 +58,89 @@ class DataTransformation:
         except Exception as e:
             raise CustomException(e, sys)
 
-    def initiate_data_transformation(self, train_path, test_path):
-        try:
-            train_df = pd.read_csv(train_path)
-            test_df = pd.read_csv(test_path)
+    def _transform(self, train_path, test_path, dtype=None):
+        # With a dtype the feature columns are parsed straight into it, and the
+        # imputer/scaler preserve float32, so no float64 copy is materialized
+        read_dtype = {col: dtype for col in NUMERICAL_COLUMNS} if dtype is not None else None
+        train_df = pd.read_csv(train_path, dtype=read_dtype)
+        test_df = pd.read_csv(test_path, dtype=read_dtype)
 
-            logging.info("Reading the train and test data files completed")
+        logging.info("Reading the train and test data files completed")
 
-            preprocessing_obj = self.get_data_transformer_object()
+        preprocessing_obj = self.get_data_transformer_object()
 
-            target_column_name = "Resource Allocation Efficiency"
+        # Input features (X) and target (y) split
+        risk_dtype = FEATURES_BY_NAME[RISK_TARGET_COLUMN].dtype
+        input_features_train = decode_frame(train_df, dtype=dtype or np.float64, allow_missing=True)
+        target_feature_train = train_df[TARGET_COLUMN].to_numpy(dtype=np.float64)
+        risk_target_train = train_df[RISK_TARGET_COLUMN].to_numpy(dtype=risk_dtype)
 
-            # Input features (X) and target (y) split
-            input_features_train_df = train_df.drop(columns=[target_column_name], axis=1)
-            target_feature_train_df = train_df[target_column_name]
+        input_features_test = decode_frame(test_df, dtype=dtype or np.float64, allow_missing=True)
+        target_feature_test = test_df[TARGET_COLUMN].to_numpy(dtype=np.float64)
+        risk_target_test = test_df[RISK_TARGET_COLUMN].to_numpy(dtype=risk_dtype)
+        del train_df, test_df
 
-            input_feature_test_df = test_df.drop(columns=[target_column_name], axis=1)
-            target_feature_test_df = test_df[target_column_name]
+        logging.info("Applying preprocessing on training and test input features")
 
-            logging.info("Applying preprocessing on training and test input features")
+        input_feature_train_arr = preprocessing_obj.fit_transform(input_features_train)
+        input_feature_test_arr = preprocessing_obj.transform(input_features_test)
 
-            # Apply the transformations
-            input_feature_train_arr = preprocessing_obj.fit_transform(input_features_train_df)
-            input_feature_test_arr = preprocessing_obj.transform(input_feature_test_df)
+        logging.info("Saving preprocessing object to file")
 
-            # Concatenate with target column
-            train_arr = np.c_[input_feature_train_arr, np.array(target_feature_train_df)]
-            test_arr = np.c_[input_feature_test_arr, np.array(target_feature_test_df)]
+        save_object(
+            file_path=self.data_transformation_config.preprocessor_obj_file_path,
+            obj=preprocessing_obj
+        )
 
-            logging.info("Saving preprocessing object to file")
+        return (
+            input_feature_train_arr,
+            {TARGET_COLUMN: target_feature_train, RISK_TARGET_COLUMN: risk_target_train},
+            input_feature_test_arr,
+            {TARGET_COLUMN: target_feature_test, RISK_TARGET_COLUMN: risk_target_test},
+        )
 
-            save_object(
-                file_path=self.data_transformation_config.preprocessor_obj_file_path,
-                obj=preprocessing_obj
-            )
+    def initiate_data_transformation(self, train_path, test_path):
+        try:
+            input_feature_train_arr, targets_train, input_feature_test_arr, targets_test = \
+                self._transform(train_path, test_path)
+
+            # Concatenate with target column
+            train_arr = np.c_[input_feature_train_arr, targets_train[TARGET_COLUMN]]
+            test_arr = np.c_[input_feature_test_arr, targets_test[TARGET_COLUMN]]
 
             return train_arr, test_arr, self.data_transformation_config.preprocessor_obj_file_path
 
         except Exception as e:
             raise CustomException(e, sys)
-######
+
+    def initiate_compact_data_transformation(self, train_path, test_path, dtype=np.float32):
+        '''
+        Same as initiate_data_transformation, but keeps features and target as
+        separate C-contiguous arrays (features in `dtype`, target in float64)
+        instead of gluing them into one float64 matrix.
+        '''
+        try:
+            X_train, targets_train, X_test, targets_test, preprocessor_path = \
+                self.initiate_multi_target_data_transformation(train_path, test_path, dtype=dtype)
+
+            return X_train, targets_train[TARGET_COLUMN], X_test, targets_test[TARGET_COLUMN], preprocessor_path
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def initiate_multi_target_data_transformation(self, train_path, test_path, dtype=np.float32):
+        '''
+        Compact transformation that also returns the "Risk Level" target, so
+        one feature matrix serves both the efficiency and the risk model.
+        Targets are returned as dicts keyed by column name.
+        '''
+        try:
+            X_train, targets_train, X_test, targets_test = self._transform(train_path, test_path, dtype=dtype)
+
+            X_train = np.ascontiguousarray(X_train, dtype=dtype)
+            X_test = np.ascontiguousarray(X_test, dtype=dtype)
+
+            return X_train, targets_train, X_test, targets_test, self.data_transformation_config.preprocessor_obj_file_path
+
+        except Exception as e:
+            raise CustomException(e, sys)
@@ -5,26 +5,72 @@ import numpy as np
 from sklearn.ensemble import (
     AdaBoostRegressor,
     GradientBoostingRegressor,
+    HistGradientBoostingClassifier,
+    HistGradientBoostingRegressor,
+    RandomForestClassifier,
     RandomForestRegressor,
 )
-from sklearn.linear_model import LinearRegression
-from sklearn.tree import DecisionTreeRegressor
-from xgboost import XGBRegressor
-from sklearn.metrics import r2_score
+from sklearn.linear_model import LinearRegression, LogisticRegression
+from sklearn.tree import DecisionTreeClassifier, DecisionTreeRegressor
+from xgboost import XGBClassifier, XGBRegressor
+from sklearn.metrics import accuracy_score, r2_score
+from sklearn.model_selection import KFold
 
 from src.mlproject.exception import CustomException
 from src.mlproject.logger import logging
-from src.mlproject.utlis import save_object, evaluate_models
+from src.mlproject.utlis import save_object, load_object, evaluate_models, model_input
+from src.mlproject.schema import TARGET_COLUMN, RISK_TARGET_COLUMN
+from src.mlproject.components.multi_target_model import MultiTargetModel
+
+# Optional histogram boosters, used as candidates only when installed
+try:
+    from catboost import CatBoostRegressor
+except ImportError:
+    CatBoostRegressor = None
+
+try:
+    from lightgbm import LGBMRegressor
+except ImportError:
+    LGBMRegressor = None
+
+
+# Estimators that train on float32 features without upcasting them
+# (sklearn trees and XGBoost work in float32 internally)
+FLOAT32_MODELS = (
+    "Random Forest",
+    "Decision Tree",
+    "Gradient Boosting",
+    "XGBRegressor",
+    "AdaBoost Regressor",
+    "Random Forest Classifier",
+    "Decision Tree Classifier",
+    "XGBClassifier",
+    "LightGBM",
+)
+
+# Parameter that sizes each library's own thread pool; evaluate_models
+# sets it so CV workers times threads stays within the CPU count
+THREADED_MODELS = {
+    "Random Forest": "n_jobs",
+    "XGBRegressor": "n_jobs",
+    "LightGBM": "n_jobs",
+    "CatBoost": "thread_count",
+    "Random Forest Classifier": "n_jobs",
+    "XGBClassifier": "n_jobs",
+}
 
 
 @dataclass
 class ModelTrainerConfig:
-    trained_model_file_path = os.path.join("artifacts", "model.pkl")
+    trained_model_file_path: str = os.path.join("artifacts", "model.pkl")
+    risk_model_file_path: str = os.path.join("artifacts", "risk_model.pkl")
+    multi_target_model_file_path: str = os.path.join("artifacts", "multi_target_model.pkl")
+    cv_folds: int = 3
 
 
 class ModelTrainer:
-    def __init__(self):
-        self.model_trainer_config = ModelTrainerConfig()
+    def __init__(self, config: ModelTrainerConfig = None):
+        self.model_trainer_config = config or ModelTrainerConfig()
 
     def initiate_model_trainer(self, train_array, test_array):
         try:
@@ -33,42 +79,109 @@ class ModelTrainer:
             X_train, y_train = train_array[:, :-1], train_array[:, -1]
             X_test, y_test = test_array[:, :-1], test_array[:, -1]
 
-            models = {
-                "Random Forest": RandomForestRegressor(),
-                "Decision Tree": DecisionTreeRegressor(),
-                "Gradient Boosting": GradientBoostingRegressor(),
-                "Linear Regression": LinearRegression(),
-                "XGBRegressor": XGBRegressor(),
-                "AdaBoost Regressor": AdaBoostRegressor(),
+            return self.initiate_compact_model_trainer(X_train, y_train, X_test, y_test)
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def get_efficiency_models(self):
+        models = {
+            "Random Forest": RandomForestRegressor(),
+            "Decision Tree": DecisionTreeRegressor(),
+            "Gradient Boosting": GradientBoostingRegressor(),
+            "Linear Regression": LinearRegression(),
+            "XGBRegressor": XGBRegressor(tree_method="hist"),
+            "AdaBoost Regressor": AdaBoostRegressor(),
+            "HistGradientBoosting": HistGradientBoostingRegressor(),
+        }
+
+        params = {
+            "Decision Tree": {
+                'criterion': ['squared_error', 'friedman_mse', 'absolute_error', 'poisson'],
+            },
+            "Random Forest": {
+                'n_estimators': [50, 100, 150]
+            },
+            "Gradient Boosting": {
+                'learning_rate': [0.1, 0.05],
+                'subsample': [0.8, 0.9],
+                'n_estimators': [100, 150]
+            },
+            "Linear Regression": {},
+            "XGBRegressor": {
+                'learning_rate': [0.1, 0.05],
+                'n_estimators': [100, 150]
+            },
+            "AdaBoost Regressor": {
+                'learning_rate': [0.1, 0.05],
+                'n_estimators': [50, 100]
+            },
+            "HistGradientBoosting": {
+                'learning_rate': [0.1, 0.05],
+                'max_iter': [100, 200]
+            }
+        }
+
+        if CatBoostRegressor is not None:
+            models["CatBoost"] = CatBoostRegressor(verbose=False, allow_writing_files=False)
+            params["CatBoost"] = {
+                'learning_rate': [0.1, 0.05],
+                'iterations': [100, 200]
             }
 
-            params = {
-                "Decision Tree": {
-                    'criterion': ['squared_error', 'friedman_mse', 'absolute_error', 'poisson'],
-                },
-                "Random Forest": {
-                    'n_estimators': [50, 100, 150]
-                },
-                "Gradient Boosting": {
-                    'learning_rate': [0.1, 0.05],
-                    'subsample': [0.8, 0.9],
-                    'n_estimators': [100, 150]
-                },
-                "Linear Regression": {},
-                "XGBRegressor": {
-                    'learning_rate': [0.1, 0.05],
-                    'n_estimators': [100, 150]
-                },
-                "AdaBoost Regressor": {
-                    'learning_rate': [0.1, 0.05],
-                    'n_estimators': [50, 100]
-                }
+        if LGBMRegressor is not None:
+            models["LightGBM"] = LGBMRegressor(verbose=-1)
+            params["LightGBM"] = {
+                'learning_rate': [0.1, 0.05],
+                'n_estimators': [100, 200]
             }
 
-            model_report: dict = evaluate_models(X_train, y_train, X_test, y_test, models, params)
+        return models, params
+
+    def get_risk_models(self):
+        models = {
+            "Random Forest Classifier": RandomForestClassifier(),
+            "Decision Tree Classifier": DecisionTreeClassifier(),
+            "Logistic Regression": LogisticRegression(max_iter=1000),
+            "XGBClassifier": XGBClassifier(tree_method="hist"),
+            "HistGradientBoosting Classifier": HistGradientBoostingClassifier(),
+        }
+
+        params = {
+            "Random Forest Classifier": {
+                'n_estimators': [50, 100, 150]
+            },
+            "Decision Tree Classifier": {
+                'criterion': ['gini', 'entropy'],
+            },
+            "Logistic Regression": {},
+            "XGBClassifier": {
+                'learning_rate': [0.1, 0.05],
+                'n_estimators': [100, 150]
+            },
+            "HistGradientBoosting Classifier": {
+                'learning_rate': [0.1, 0.05],
+                'max_iter': [100, 200]
+            }
+        }
+
+        return models, params
+
+    def initiate_compact_model_trainer(self, X_train, y_train, X_test, y_test):
+        '''
+        Trains on separate feature/target arrays, as returned by
+        DataTransformation.initiate_compact_data_transformation.
+        '''
+        try:
+            models, params = self.get_efficiency_models()
+
+            model_report: dict = evaluate_models(
+                X_train, y_train, X_test, y_test, models, params,
+                float32_models=FLOAT32_MODELS, threaded_models=THREADED_MODELS,
+            )
 
-            best_model_score = max(model_report.values())
-            best_model_name = max(model_report, key=model_report.get)
+            best_model_name = max(model_report, key=lambda name: model_report[name]["score"])
+            best_model_score = model_report[best_model_name]["score"]
             best_model = models[best_model_name]
 
             logging.info(f"Best Model Found: {best_model_name} with R² Score: {best_model_score}")
@@ -82,12 +195,69 @@ class ModelTrainer:
             )
 
             # Fit best model on training data
-            best_model.fit(X_train, y_train)
+            accepts_float32 = best_model_name in FLOAT32_MODELS
+            best_model.fit(model_input(X_train, accepts_float32), y_train)
 
-            predictions = best_model.predict(X_test)
+            predictions = best_model.predict(model_input(X_test, accepts_float32))
             r2_square = r2_score(y_test, predictions)
 
             return r2_square
 
         except Exception as e:
             raise CustomException(e, sys)
+
+    def initiate_multi_target_model_trainer(self, X_train, targets_train, X_test, targets_test, preprocessor_path):
+        '''
+        Trains the efficiency regressor and the risk-level classifier on the
+        same feature matrix and the same CV folds, then saves both models
+        together with the preprocessor as one combined artifact.
+        '''
+        try:
+            config = self.model_trainer_config
+
+            # One fold split shared by both searches, so both targets are
+            # tuned on exactly the same rows and the indices are built once
+            folds = list(KFold(n_splits=config.cv_folds, shuffle=True, random_state=42).split(X_train))
+
+            searches = {
+                TARGET_COLUMN: (self.get_efficiency_models(), r2_score, config.trained_model_file_path),
+                RISK_TARGET_COLUMN: (self.get_risk_models(), accuracy_score, config.risk_model_file_path),
+            }
+
+            # Both targets share the features, so the per-dtype model inputs
+            # (e.g. the float64 copy for linear models) are materialized once
+            inputs = {}
+
+            best_models = {}
+            float32_targets = []
+            scores = {}
+
+            for target, ((models, params), scoring, model_file_path) in searches.items():
+                model_report: dict = evaluate_models(
+                    X_train, targets_train[target], X_test, targets_test[target],
+                    models, params, float32_models=FLOAT32_MODELS, cv=folds, scoring=scoring,
+                    threaded_models=THREADED_MODELS, inputs=inputs,
+                )
+
+                best_model_name = max(model_report, key=lambda name: model_report[name]["score"])
+                best_models[target] = models[best_model_name]
+                scores[target] = model_report[best_model_name]["score"]
+                if best_model_name in FLOAT32_MODELS:
+                    float32_targets.append(target)
+
+                logging.info(f"Best Model Found for {target}: {best_model_name} with "
+                             f"{scoring.__name__}: {scores[target]}")
+
+                save_object(file_path=model_file_path, obj=best_models[target])
+
+            multi_target_model = MultiTargetModel(
+                preprocessor=load_object(file_path=preprocessor_path),
+                models=best_models,
+                float32_targets=float32_targets,
+            )
+            save_object(file_path=config.multi_target_model_file_path, obj=multi_target_model)
+
+            return scores
+
+        except Exception as e:
+            raise CustomException(e, sys)
@@ -0,0 +1,53 @@
+import sys
+
+import numpy as np
+
+from src.mlproject.exception import CustomException
+from src.mlproject.concurrency import predict_limited
+from src.mlproject.schema import decode_frame, preprocessor_input
+
+
+class MultiTargetModel:
+    '''
+    Bundles the fitted preprocessor with one model per target so a request
+    batch is preprocessed once and every model reads the same scaled buffer.
+    '''
+
+    def __init__(self, preprocessor, models: dict, float32_targets=()):
+        self.preprocessor = preprocessor
+        self.models = models
+        self.float32_targets = tuple(float32_targets)
+
+    @property
+    def targets(self):
+        return list(self.models.keys())
+
+    def transform(self, features):
+        # features is a canonical-order batch from schema.decode_*; DataFrames
+        # (e.g. from older callers) are decoded into one first
+        if not isinstance(features, np.ndarray):
+            features = decode_frame(features, allow_missing=True)
+        data_scaled = self.preprocessor.transform(preprocessor_input(self.preprocessor, features))
+        return np.ascontiguousarray(data_scaled, dtype=np.float64)
+
+    def predict_scaled(self, data_scaled):
+        # Trees/XGBoost were trained on float32; cast once and share that copy
+        data_scaled_32 = None
+        predictions = {}
+
+        for target, model in self.models.items():
+            if target in self.float32_targets:
+                if data_scaled_32 is None:
+                    data_scaled_32 = data_scaled.astype(np.float32)
+                predictions[target] = predict_limited(model, data_scaled_32)
+            else:
+                predictions[target] = predict_limited(model, data_scaled)
+
+        return predictions
+
+    def predict(self, features):
+        try:
+            return self.predict_scaled(self.transform(features))
+
+        except Exception as e:
+            raise CustomException(e, sys)
@@ -0,0 +1,223 @@
+import os
+import sys
+import json
+import time
+import queue
+import atexit
+import sqlite3
+import threading
+from contextlib import closing
+from dataclasses import dataclass
+
+from src.mlproject.exception import CustomException
+from src.mlproject.logger import logging
+from src.mlproject.concurrency import drain_queue
+
+
+@dataclass
+class PredictionStoreConfig:
+    db_path: str = os.path.join("artifacts", "predictions.db")
+    batch_size: int = 1000
+    flush_interval: float = 0.5
+    # Width of the pre-aggregated time buckets the dashboard charts read
+    bucket_seconds: int = 60 * 60
+
+
+SCHEMA = [
+    '''CREATE TABLE IF NOT EXISTS predictions (
+        id INTEGER PRIMARY KEY,
+        ts REAL NOT NULL,
+        model_version TEXT NOT NULL,
+        inputs TEXT NOT NULL,
+        efficiency REAL,
+        risk_level REAL
+    )''',
+    "CREATE INDEX IF NOT EXISTS idx_predictions_ts ON predictions (ts)",
+    "CREATE INDEX IF NOT EXISTS idx_predictions_version_ts ON predictions (model_version, ts)",
+    '''CREATE TABLE IF NOT EXISTS prediction_buckets (
+        bucket_start INTEGER NOT NULL,
+        model_version TEXT NOT NULL,
+        n INTEGER NOT NULL,
+        efficiency_sum REAL NOT NULL,
+        efficiency_min REAL,
+        efficiency_max REAL,
+        risk_sum REAL NOT NULL,
+        risk_n INTEGER NOT NULL,
+        PRIMARY KEY (bucket_start, model_version)
+    )''',
+]
+
+INSERT_PREDICTION = '''INSERT INTO predictions (ts, model_version, inputs, efficiency, risk_level)
+    VALUES (?, ?, ?, ?, ?)'''
+
+UPSERT_BUCKET = '''INSERT INTO prediction_buckets
+    (bucket_start, model_version, n, efficiency_sum, efficiency_min, efficiency_max, risk_sum, risk_n)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT (bucket_start, model_version) DO UPDATE SET
+        n = n + excluded.n,
+        efficiency_sum = efficiency_sum + excluded.efficiency_sum,
+        efficiency_min = min(coalesce(efficiency_min, excluded.efficiency_min),
+                             coalesce(excluded.efficiency_min, efficiency_min)),
+        efficiency_max = max(coalesce(efficiency_max, excluded.efficiency_max),
+                             coalesce(excluded.efficiency_max, efficiency_max)),
+        risk_sum = risk_sum + excluded.risk_sum,
+        risk_n = risk_n + excluded.risk_n'''
+
+
+def _connect(db_path):
+    connection = sqlite3.connect(db_path, timeout=30)
+    # WAL lets dashboard reads run while the writer inserts
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")
+    return connection
+
+
+class PredictionStore:
+    '''
+    Append-only SQLite store of input/prediction pairs. record() only
+    enqueues; a background thread batch-inserts the rows and folds them into
+    per-bucket aggregates in the same transaction.
+    '''
+
+    def __init__(self, config: PredictionStoreConfig = None):
+        self.prediction_store_config = config or PredictionStoreConfig()
+        self._queue = queue.SimpleQueue()
+        self._stop_event = threading.Event()
+        self._writer = None
+
+        db_dir = os.path.dirname(self.prediction_store_config.db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+        with closing(_connect(self.prediction_store_config.db_path)) as connection:
+            for statement in SCHEMA:
+                connection.execute(statement)
+            connection.commit()
+
+    def start(self):
+        if self._writer is None:
+            self._stop_event.clear()
+            self._writer = threading.Thread(target=self._run, name="prediction-store-writer", daemon=True)
+            self._writer.start()
+            atexit.register(self.stop)
+        return self
+
+    def stop(self):
+        if self._writer is not None:
+            self._stop_event.set()
+            self._writer.join()
+            self._writer = None
+
+    def record(self, inputs: dict, efficiency, risk_level=None, model_version="unknown", ts=None):
+        self._queue.put((
+            time.time() if ts is None else ts,
+            model_version,
+            inputs,
+            None if efficiency is None else float(efficiency),
+            None if risk_level is None else float(risk_level),
+        ))
+
+    def _drain(self, block):
+        config = self.prediction_store_config
+        return drain_queue(self._queue, config.batch_size, config.flush_interval, block)
+
+    def _buckets(self, records):
+        bucket_seconds = self.prediction_store_config.bucket_seconds
+        buckets = {}
+        for ts, model_version, _, efficiency, risk_level in records:
+            key = (int(ts // bucket_seconds) * bucket_seconds, model_version)
+            n, eff_sum, eff_min, eff_max, risk_sum, risk_n = buckets.get(key, (0, 0.0, None, None, 0.0, 0))
+            if efficiency is not None:
+                n += 1
+                eff_sum += efficiency
+                eff_min = efficiency if eff_min is None else min(eff_min, efficiency)
+                eff_max = efficiency if eff_max is None else max(eff_max, efficiency)
+            if risk_level is not None:
+                risk_sum += risk_level
+                risk_n += 1
+            buckets[key] = (n, eff_sum, eff_min, eff_max, risk_sum, risk_n)
+        return [key + value for key, value in buckets.items()]
+
+    def _write(self, connection, records):
+        if not records:
+            return
+        with connection:
+            connection.executemany(INSERT_PREDICTION, [
+                (ts, model_version, json.dumps(inputs), efficiency, risk_level)
+                for ts, model_version, inputs, efficiency, risk_level in records
+            ])
+            connection.executemany(UPSERT_BUCKET, self._buckets(records))
+
+    def _run(self):
+        connection = _connect(self.prediction_store_config.db_path)
+        try:
+            while not self._stop_event.is_set():
+                try:
+                    self._write(connection, self._drain(block=True))
+                except Exception as e:
+                    logging.exception(f"Prediction store write failed: {e}")
+            while True:
+                records = self._drain(block=False)
+                if not records:
+                    break
+                self._write(connection, records)
+        finally:
+            connection.close()
+
+    def history(self, since=None, until=None, model_version=None, limit=500):
+        '''
+        Most recent predictions in [since, until), newest first.
+        '''
+        try:
+            query = "SELECT ts, model_version, inputs, efficiency, risk_level FROM predictions WHERE ts >= ? AND ts < ?"
+            args = [since or 0.0, until or float("inf")]
+            if model_version is not None:
+                query += " AND model_version = ?"
+                args.append(model_version)
+            query += " ORDER BY ts DESC LIMIT ?"
+            args.append(limit)
+
+            with closing(_connect(self.prediction_store_config.db_path)) as connection:
+                rows = connection.execute(query, args).fetchall()
+
+            return [
+                {"ts": ts, "model_version": version, "inputs": json.loads(inputs),
+                 "efficiency": efficiency, "risk_level": risk_level}
+                for ts, version, inputs, efficiency, risk_level in rows
+            ]
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def aggregates(self, since=None, until=None, model_version=None):
+        '''
+        Per-bucket count/mean/min/max of predicted efficiency and mean risk,
+        read from the pre-aggregated bucket table. The bucket containing
+        `since` is included whole.
+        '''
+        try:
+            query = '''SELECT bucket_start, SUM(n), SUM(efficiency_sum), MIN(efficiency_min), MAX(efficiency_max),
+                              SUM(risk_sum), SUM(risk_n)
+                       FROM prediction_buckets WHERE bucket_start >= ? AND bucket_start < ?'''
+            # A bucket is keyed by its start, so the one containing `since`
+            # starts before it; round down to keep that partial first bucket
+            bucket_seconds = self.prediction_store_config.bucket_seconds
+            since = int(since // bucket_seconds) * bucket_seconds if since else 0
+            args = [since, until or float("inf")]
+            if model_version is not None:
+                query += " AND model_version = ?"
+                args.append(model_version)
+            query += " GROUP BY bucket_start ORDER BY bucket_start"
+
+            with closing(_connect(self.prediction_store_config.db_path)) as connection:
+                rows = connection.execute(query, args).fetchall()
+
+            return [
+                {"bucket_start": bucket_start, "count": n,
+                 "efficiency_mean": eff_sum / n if n else None,
+                 "efficiency_min": eff_min, "efficiency_max": eff_max,
+                 "risk_mean": risk_sum / risk_n if risk_n else None}
+                for bucket_start, n, eff_sum, eff_min, eff_max, risk_sum, risk_n in rows
+            ]
+
+        except Exception as e:
+            raise CustomException(e, sys)
@@ -0,0 +1,215 @@
+import os
+import sys
+import time
+import threading
+import multiprocessing
+from dataclasses import dataclass
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from joblib import cpu_count
+
+from src.mlproject.exception import CustomException
+from src.mlproject.logger import logging
+from src.mlproject.concurrency import limit_worker_threads
+from src.mlproject.schema import FEATURE_COLUMNS, INTEGER_MASK, TARGET_COLUMN, decode_records
+
+
+@dataclass
+class ResourceOptimizerConfig:
+    population_size: int = 64
+    elite_fraction: float = 0.25
+    generations: int = 40
+    n_restarts: int = cpu_count()
+    n_workers: int = cpu_count()
+    time_budget_s: float = 1.0
+    # Integer features in the schema (e.g. labor and equipment counts) are
+    # rounded; False searches them as continuous values
+    integer_allocations: bool = True
+    seed: int = 42
+
+
+# Per-process model, populated once by the pool initializer
+_worker_model = None
+
+
+def _init_worker(model):
+    global _worker_model
+
+    limit_worker_threads()
+    _worker_model = model
+
+
+def _search(model, base_row, search_idx, lower, upper, integer_dims, config, seed, deadline):
+    '''
+    Cross-entropy evolutionary search in the box [lower, upper]. Each
+    generation is scored as one batch through the preprocessor and model.
+    '''
+    rng = np.random.default_rng(seed)
+    n_dims = len(search_idx)
+    n_elite = max(1, int(config.population_size * config.elite_fraction))
+    span = upper - lower
+
+    # The search runs in the unit cube; candidates are mapped back to the bounds
+    mean = rng.uniform(0.0, 1.0, n_dims)
+    sigma = np.full(n_dims, 0.3)
+
+    batch = np.tile(base_row, (config.population_size, 1))
+    best_score = -np.inf
+    best_allocation = None
+    evaluations = 0
+
+    for _ in range(config.generations):
+        if time.time() >= deadline:
+            break
+
+        population = np.clip(mean + sigma * rng.standard_normal((config.population_size, n_dims)), 0.0, 1.0)
+        allocations = lower + population * span
+        allocations[:, integer_dims] = np.round(allocations[:, integer_dims])
+
+        batch[:, search_idx] = allocations
+        scores = model.predict(batch)[TARGET_COLUMN]
+        evaluations += len(scores)
+
+        elite = np.argsort(scores)[::-1][:n_elite]
+        if scores[elite[0]] > best_score:
+            best_score = float(scores[elite[0]])
+            best_allocation = allocations[elite[0]].copy()
+
+        elite_population = population[elite]
+        mean = elite_population.mean(axis=0)
+        sigma = np.maximum(elite_population.std(axis=0), 1e-3)
+
+    return best_score, best_allocation, evaluations
+
+
+def _search_in_worker(*args):
+    return _search(_worker_model, *args)
+
+
+def _worker_ready(_):
+    return os.getpid()
+
+
+class ResourceOptimizer:
+    '''
+    Searches labor/equipment allocations that maximize the predicted
+    "Resource Allocation Efficiency" for otherwise fixed project inputs.
+    '''
+
+    def __init__(self, model, config: ResourceOptimizerConfig = None):
+        self.model = model
+        self.resource_optimizer_config = config or ResourceOptimizerConfig()
+        self._executor = None
+        self._executor_lock = threading.Lock()
+
+    def _uses_workers(self):
+        config = self.resource_optimizer_config
+        return config.n_workers > 1 and config.n_restarts > 1
+
+    def _get_executor(self):
+        # Created once and kept, so workers load the model only once.
+        # The server is multithreaded by then (Flask, log and store writers),
+        # and forking it can deadlock on locks held at fork time, so workers
+        # come from a forkserver (spawn where unavailable) and get the model
+        # through initargs
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = self._start_executor()
+            return self._executor
+
+    def _start_executor(self):
+        start_method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+        executor = ProcessPoolExecutor(
+            max_workers=self.resource_optimizer_config.n_workers,
+            mp_context=multiprocessing.get_context(start_method),
+            initializer=_init_worker,
+            initargs=(self.model,),
+        )
+        # Workers start together on the first submit; waiting for them here
+        # keeps their startup out of any request's search budget
+        start = time.time()
+        list(executor.map(_worker_ready, range(self.resource_optimizer_config.n_workers)))
+        logging.info(f"Resource optimizer pool started ({start_method}) in {time.time() - start:.2f}s")
+        return executor
+
+    def start(self):
+        '''
+        Starts the worker pool and waits until every worker is ready, so the
+        first optimize() call does not pay for it.
+        '''
+        try:
+            if self._uses_workers():
+                self._get_executor()
+            return self
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def shutdown(self):
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+
+    def optimize(self, base_plan: dict, bounds: dict):
+        '''
+        base_plan maps every input feature (column name or form field) to its
+        value; bounds maps the column names to search (e.g.
+        "Labor Requirements") to (low, high).
+        Returns the best allocation found within the time budget.
+        '''
+        try:
+            config = self.resource_optimizer_config
+            use_workers = self._uses_workers()
+            executor = self._get_executor() if use_workers else None
+            start = time.time()
+            deadline = start + config.time_budget_s
+
+            base_row = decode_records([base_plan])[0]
+            search_columns = list(bounds.keys())
+            search_idx = [FEATURE_COLUMNS.index(col) for col in search_columns]
+            lower = np.array([float(bounds[col][0]) for col in search_columns])
+            upper = np.array([float(bounds[col][1]) for col in search_columns])
+
+            if np.any(lower > upper):
+                raise ValueError(f"Invalid bounds: {bounds}")
+            integer_dims = INTEGER_MASK[search_idx] & config.integer_allocations
+            # Searching between the outermost integers keeps rounded candidates in bounds
+            lower[integer_dims] = np.ceil(lower[integer_dims])
+            upper[integer_dims] = np.floor(upper[integer_dims])
+            if np.any(lower > upper):
+                raise ValueError(f"Bounds contain no integer allocation: {bounds}")
+
+            args = [
+                (base_row, search_idx, lower, upper, integer_dims, config, config.seed + restart, deadline)
+                for restart in range(config.n_restarts)
+            ]
+
+            if use_workers:
+                results = list(executor.map(_search_in_worker, *zip(*args)))
+            else:
+                results = [_search(self.model, *restart_args) for restart_args in args]
+
+            results = [result for result in results if result[1] is not None]
+            if not results:
+                raise ValueError("No candidate was evaluated within the time budget")
+
+            best_score, best_allocation, _ = max(results, key=lambda result: result[0])
+            evaluations = sum(result[2] for result in results)
+            elapsed = time.time() - start
+
+            logging.info(f"Resource optimization: best predicted efficiency {best_score:.4f} "
+                         f"after {evaluations} evaluations in {elapsed:.3f}s")
+
+            return {
+                "allocation": dict(zip(search_columns, best_allocation.tolist())),
+                "predicted_efficiency": best_score,
+                "baseline_efficiency": float(self.model.predict(base_row[None, :])[TARGET_COLUMN][0]),
+                "evaluations": evaluations,
+                "restarts": len(results),
+                "seconds": elapsed,
+            }
+
+        except Exception as e:
+            raise CustomException(e, sys)
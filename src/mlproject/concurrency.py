@@ -0,0 +1,41 @@
+import queue
+
+
+def drain_queue(source, batch_size, timeout, block=True):
+    '''
+    Takes up to batch_size items from source for a batched writer thread.
+    With block, waits up to timeout seconds for the first item; the rest are
+    taken only if already queued.
+    '''
+    items = []
+    try:
+        items.append(source.get(timeout=timeout) if block else source.get_nowait())
+        while len(items) < batch_size:
+            items.append(source.get_nowait())
+    except queue.Empty:
+        pass
+    return items
+
+
+def limit_worker_threads(n_threads=1):
+    '''
+    Caps BLAS/OpenMP pools in a process-pool worker. One worker per core
+    already saturates the host, so library threads inside each worker would
+    only oversubscribe it.
+    '''
+    try:
+        from threadpoolctl import threadpool_limits
+        threadpool_limits(n_threads)
+    except ImportError:
+        pass
+
+
+def predict_limited(model, X, n_threads=1):
+    '''
+    Predicts with at most n_threads library threads. CatBoost ignores the
+    thread_count it was fitted with and predicts on every core unless told
+    otherwise per call; other models take their pickled thread settings.
+    '''
+    if type(model).__module__.split(".")[0] == "catboost":
+        return model.predict(X, thread_count=n_threads)
+    return model.predict(X)
@@ -1,15 +1,195 @@
 import logging
+import logging.handlers
 import os
-from datetime import datetime
+import sys
+import time
+import queue
+import random
+import atexit
+import threading
+import multiprocessing.util
 
-LOG_FILE=f"{datetime.now().strftime('%m_%d_%Y_%H_%M_%S')}.log"
-log_path=os.path.join(os.getcwd(),"logs",LOG_FILE)
-os.makedirs(log_path,exist_ok=True)
+try:
+    import fcntl
+except ImportError:  # Windows: rotation across processes is not locked
+    fcntl=None
 
-LOG_FILE_PATH=os.path.join(log_path,LOG_FILE)
+from src.mlproject.concurrency import drain_queue
 
-logging.basicConfig(
-    filename=LOG_FILE_PATH,
-    format="[ %(asctime)s ] %(lineno)d %(name)s - %(levelname)s - %(message)s",
-    level=logging.INFO,
-)
+# One log stream per service (e.g. "app", "yapp"), shared by all of its
+# processes, instead of a new timestamped directory per process
+LOG_DIR=os.getenv("LOG_DIR",os.path.join(os.getcwd(),"logs"))
+_script=sys.argv[0] if sys.argv and not sys.argv[0].startswith("-") else ""
+SERVICE_NAME=os.getenv("LOG_SERVICE") or os.path.splitext(os.path.basename(_script))[0] or "python"
+LOG_FILE=f"{SERVICE_NAME}.log"
+os.makedirs(LOG_DIR,exist_ok=True)
+
+LOG_FILE_PATH=os.path.join(LOG_DIR,LOG_FILE)
+
+LOG_FORMAT="[ %(asctime)s ] %(process)d %(lineno)d %(name)s - %(levelname)s - %(message)s"
+LOG_MAX_BYTES=int(os.getenv("LOG_MAX_BYTES",10*1024*1024))
+LOG_ROTATE_SECONDS=float(os.getenv("LOG_ROTATE_SECONDS",24*60*60))
+LOG_BACKUP_COUNT=int(os.getenv("LOG_BACKUP_COUNT",5))
+LOG_BATCH_SIZE=int(os.getenv("LOG_BATCH_SIZE",512))
+LOG_FLUSH_INTERVAL=float(os.getenv("LOG_FLUSH_INTERVAL",0.5))
+LOG_REQUEST_SAMPLE_RATE=float(os.getenv("LOG_REQUEST_SAMPLE_RATE",1.0))
+
+
+class BatchLogWriter(threading.Thread):
+    '''
+    Background thread that drains the log queue and writes records in
+    batches, rotating the file once it exceeds max_bytes or max_age seconds.
+    Callers only pay for a queue.put.
+    '''
+
+    def __init__(self, log_queue, file_path, formatter, max_bytes=LOG_MAX_BYTES, max_age=LOG_ROTATE_SECONDS,
+                 backup_count=LOG_BACKUP_COUNT, batch_size=LOG_BATCH_SIZE, flush_interval=LOG_FLUSH_INTERVAL):
+        super().__init__(name="log-writer",daemon=True)
+        self.log_queue=log_queue
+        self.file_path=file_path
+        self.formatter=formatter
+        self.max_bytes=max_bytes
+        self.max_age=max_age
+        self.backup_count=backup_count
+        self.batch_size=batch_size
+        self.flush_interval=flush_interval
+        self._stop_event=threading.Event()
+        self._stream=None
+        self._time_bucket=0
+
+    def _open(self):
+        self._stream=open(self.file_path,"a",encoding="utf-8")
+        # Time-based rotation uses fixed buckets so every process of the
+        # service agrees on when the stream rolls over
+        self._time_bucket=int(time.time()//self.max_age)
+
+    def _rotated_elsewhere(self):
+        # Another process of the same service already rotated the file
+        try:
+            return os.stat(self.file_path).st_ino!=os.fstat(self._stream.fileno()).st_ino
+        except FileNotFoundError:
+            return True
+
+    def _should_rotate(self):
+        return (self._stream.tell()>=self.max_bytes) or (int(time.time()//self.max_age)!=self._time_bucket)
+
+    def _rotate(self):
+        self._stream.close()
+        for i in range(self.backup_count-1,0,-1):
+            src=f"{self.file_path}.{i}"
+            if os.path.exists(src):
+                os.replace(src,f"{self.file_path}.{i+1}")
+        if self.backup_count>0 and os.path.exists(self.file_path):
+            os.replace(self.file_path,f"{self.file_path}.1")
+        self._open()
+
+    def _rotation_lock(self):
+        # Sidecar lock file, so processes of the same service rotate one at a time
+        lock_file=open(f"{self.file_path}.lock","a")
+        if fcntl is not None:
+            fcntl.flock(lock_file,fcntl.LOCK_EX)
+        return lock_file
+
+    def _format(self, record):
+        try:
+            return self.formatter.format(record)
+        except Exception:
+            return f"Unformattable log record: {record.msg!r}"
+
+    def _write(self, records):
+        if not records:
+            return
+        self._stream.write("\n".join(self._format(record) for record in records)+"\n")
+        self._stream.flush()
+        if not (self._rotated_elsewhere() or self._should_rotate()):
+            return
+        # Re-checked under the lock: another process may have rotated the
+        # file since, in which case this one only reopens it
+        with self._rotation_lock():
+            if self._rotated_elsewhere():
+                self._stream.close()
+                self._open()
+            elif self._should_rotate():
+                self._rotate()
+
+    def _drain(self, block):
+        return drain_queue(self.log_queue,self.batch_size,self.flush_interval,block)
+
+    def run(self):
+        self._open()
+        while not self._stop_event.is_set():
+            self._write(self._drain(block=True))
+        # Flush whatever was queued before shutdown
+        while True:
+            records=self._drain(block=False)
+            if not records:
+                break
+            self._write(records)
+        self._stream.close()
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+
+class SamplingFilter(logging.Filter):
+    '''
+    Lets through a fraction `rate` of INFO-and-below records; warnings and
+    errors always pass.
+    '''
+
+    def __init__(self, rate):
+        super().__init__()
+        self.rate=rate
+
+    def filter(self, record):
+        return record.levelno>logging.INFO or self.rate>=1.0 or random.random()<self.rate
+
+
+_log_queue=queue.SimpleQueue()
+_writer=None
+
+
+def _start_writer():
+    global _log_queue,_writer
+    _log_queue=queue.SimpleQueue()
+    _writer=BatchLogWriter(_log_queue,LOG_FILE_PATH,logging.Formatter(LOG_FORMAT))
+    _writer.start()
+
+    root=logging.getLogger()
+    for handler in list(root.handlers):
+        if isinstance(handler,logging.handlers.QueueHandler):
+            root.removeHandler(handler)
+    root.addHandler(logging.handlers.QueueHandler(_log_queue))
+
+
+def _after_fork_in_child():
+    _start_writer()
+    # Pool workers leave through os._exit, which skips atexit
+    multiprocessing.util.Finalize(None,shutdown_logging,exitpriority=10)
+
+
+def shutdown_logging():
+    global _writer
+    if _writer is not None:
+        _writer.stop()
+        _writer=None
+
+
+def get_request_logger(name="requests"):
+    '''
+    Logger for per-request INFO logs, sampled at LOG_REQUEST_SAMPLE_RATE.
+    '''
+    request_logger=logging.getLogger(name)
+    if not any(isinstance(f,SamplingFilter) for f in request_logger.filters):
+        request_logger.addFilter(SamplingFilter(LOG_REQUEST_SAMPLE_RATE))
+    return request_logger
+
+
+logging.getLogger().setLevel(logging.INFO)
+_start_writer()
+atexit.register(shutdown_logging)
+# A forked child (e.g. a process-pool worker) does not inherit the writer
+# thread, so it gets its own queue and writer on the same service stream
+if hasattr(os,"register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
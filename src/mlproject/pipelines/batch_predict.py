@@ -0,0 +1,273 @@
+import os
+import sys
+import time
+import json
+import shutil
+import argparse
+from dataclasses import dataclass
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+import pandas as pd
+from joblib import cpu_count
+
+from src.mlproject.exception import CustomException
+from src.mlproject.logger import logging
+from src.mlproject.utlis import load_object, artifact_version
+from src.mlproject.concurrency import limit_worker_threads, predict_limited
+from src.mlproject.schema import decode_frame, preprocessor_input
+
+
+@dataclass
+class BatchPredictionConfig:
+    model_file_path: str = os.path.join("artifacts", "model.pkl")
+    preprocessor_file_path: str = os.path.join("artifacts", "preprocessor.pkl")
+    prediction_column: str = "Resource Allocation Efficiency"
+    chunk_size: int = 50_000
+    n_workers: int = cpu_count()
+    include_input: bool = True
+
+
+# Per-process state, populated once by the pool initializer
+_worker_model = None
+_worker_preprocessor = None
+
+
+def _init_worker(model_file_path, preprocessor_file_path):
+    global _worker_model, _worker_preprocessor
+
+    limit_worker_threads()
+    _worker_model = load_object(file_path=model_file_path)
+    _worker_preprocessor = load_object(file_path=preprocessor_file_path)
+
+
+def _score_chunk(chunk_index, chunk, part_path, prediction_column, include_input):
+    # Missing values are left to the preprocessor's imputer
+    features = decode_frame(chunk, allow_missing=True)
+    preds = predict_limited(_worker_model, _worker_preprocessor.transform(preprocessor_input(_worker_preprocessor, features)))
+
+    if include_input:
+        out = chunk.copy()
+        out[prediction_column] = preds
+    else:
+        out = pd.DataFrame({prediction_column: preds}, index=chunk.index)
+
+    # Write to a temp name first so a crash never leaves a half-written part
+    tmp_path = part_path + ".tmp"
+    if part_path.endswith(".parquet"):
+        out.to_parquet(tmp_path, index=False)
+    else:
+        out.to_csv(tmp_path, index=False, header=chunk_index == 0)
+    os.replace(tmp_path, part_path)
+
+    return chunk_index, len(out)
+
+
+def _file_format(path):
+    return "parquet" if path.lower().endswith((".parquet", ".pq")) else "csv"
+
+
+def read_chunks(input_path, chunk_size):
+    '''
+    Yields non-empty DataFrames of at most chunk_size rows without loading
+    the whole file.
+    '''
+    if _file_format(input_path) == "parquet":
+        import pyarrow.parquet as pq
+
+        parquet_file = pq.ParquetFile(input_path)
+        chunks = (batch.to_pandas() for batch in parquet_file.iter_batches(batch_size=chunk_size))
+    else:
+        chunks = pd.read_csv(input_path, chunksize=chunk_size)
+
+    # A header-only CSV yields one empty chunk
+    for chunk in chunks:
+        if len(chunk):
+            yield chunk
+
+
+class BatchPredictPipeline:
+    def __init__(self, config: BatchPredictionConfig = None):
+        self.batch_prediction_config = config or BatchPredictionConfig()
+
+    def _parts_dir(self, output_path):
+        return output_path + ".parts"
+
+    def _part_path(self, parts_dir, chunk_index, fmt):
+        return os.path.join(parts_dir, f"part-{chunk_index:06d}.{fmt}")
+
+    def _manifest(self, input_path):
+        config = self.batch_prediction_config
+        input_stat = os.stat(input_path)
+        return {
+            "input_path": os.path.abspath(input_path),
+            "input_size": input_stat.st_size,
+            "input_mtime_ns": input_stat.st_mtime_ns,
+            "chunk_size": config.chunk_size,
+            "include_input": config.include_input,
+            "prediction_column": config.prediction_column,
+            "model": artifact_version(config.model_file_path),
+            "preprocessor": artifact_version(config.preprocessor_file_path),
+        }
+
+    def _prepare_parts_dir(self, parts_dir, manifest):
+        '''
+        Keeps the parts of a previous run only if that run scored the same
+        input with the same chunking and artifacts; otherwise starts over.
+        '''
+        manifest_path = os.path.join(parts_dir, "manifest.json")
+        if os.path.isdir(parts_dir):
+            try:
+                with open(manifest_path) as manifest_file:
+                    previous = json.load(manifest_file)
+            except (FileNotFoundError, ValueError):
+                previous = None
+            if previous == manifest:
+                return
+            logging.warning(f"Discarding parts in {parts_dir}: they were produced by a different "
+                            f"input, chunk size or model")
+            shutil.rmtree(parts_dir)
+
+        os.makedirs(parts_dir)
+        with open(manifest_path, "w") as manifest_file:
+            json.dump(manifest, manifest_file, indent=2)
+
+    def _write_empty_output(self, input_path, output_path, fmt):
+        # Same columns a non-empty run would write, with no rows
+        config = self.batch_prediction_config
+        columns = []
+        if config.include_input:
+            if _file_format(input_path) == "parquet":
+                import pyarrow.parquet as pq
+
+                columns = pq.read_schema(input_path).names
+            else:
+                columns = list(pd.read_csv(input_path, nrows=0).columns)
+        # As in _score_chunk, an input prediction column is overwritten, not duplicated
+        columns = [column for column in columns if column != config.prediction_column]
+        out = pd.DataFrame(columns=columns + [config.prediction_column])
+        if fmt == "parquet":
+            out.to_parquet(output_path, index=False)
+        else:
+            out.to_csv(output_path, index=False)
+
+    def _merge_parts(self, parts_dir, n_chunks, output_path, fmt):
+        part_paths = [self._part_path(parts_dir, i, fmt) for i in range(n_chunks)]
+
+        if fmt == "parquet":
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            # Each part carries the dtypes pandas inferred for its own chunk
+            # (e.g. an int column becomes float64 once a chunk has a blank),
+            # so parts are cast to one schema that fits all of them
+            schema = pa.unify_schemas([pq.read_schema(part_path) for part_path in part_paths],
+                                      promote_options="permissive")
+            with pq.ParquetWriter(output_path, schema) as writer:
+                for part_path in part_paths:
+                    writer.write_table(pq.read_table(part_path).cast(schema))
+        else:
+            # Only part 0 carries the header, so CSV parts concatenate byte-for-byte
+            with open(output_path, "wb") as out_file:
+                for part_path in part_paths:
+                    with open(part_path, "rb") as part_file:
+                        shutil.copyfileobj(part_file, out_file)
+
+        shutil.rmtree(parts_dir)
+
+    def initiate_batch_prediction(self, input_path, output_path):
+        '''
+        Scores input_path chunk by chunk on a process pool and writes the
+        predictions to output_path in input order. Completed chunks are kept
+        in "<output_path>.parts" so a rerun after a crash resumes from them,
+        as long as the input, chunk size and artifacts are unchanged.
+        '''
+        try:
+            config = self.batch_prediction_config
+            fmt = _file_format(output_path)
+            parts_dir = self._parts_dir(output_path)
+            self._prepare_parts_dir(parts_dir, self._manifest(input_path))
+
+            logging.info(f"Batch prediction started: {input_path} -> {output_path} "
+                         f"(chunk_size={config.chunk_size}, n_workers={config.n_workers})")
+
+            start = time.perf_counter()
+            n_chunks = 0
+            scored_rows = 0
+            skipped_chunks = 0
+            # Bound the chunks held in memory to a couple per worker
+            max_pending = 2 * config.n_workers
+            pending = set()
+
+            with ProcessPoolExecutor(
+                max_workers=config.n_workers,
+                initializer=_init_worker,
+                initargs=(config.model_file_path, config.preprocessor_file_path),
+            ) as executor:
+                for chunk_index, chunk in enumerate(read_chunks(input_path, config.chunk_size)):
+                    n_chunks += 1
+                    part_path = self._part_path(parts_dir, chunk_index, fmt)
+
+                    if os.path.exists(part_path):
+                        skipped_chunks += 1
+                        continue
+
+                    if len(pending) >= max_pending:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            scored_rows += future.result()[1]
+
+                    pending.add(executor.submit(
+                        _score_chunk, chunk_index, chunk, part_path,
+                        config.prediction_column, config.include_input,
+                    ))
+
+                for future in wait(pending).done:
+                    scored_rows += future.result()[1]
+
+            if n_chunks == 0:
+                self._write_empty_output(input_path, output_path, fmt)
+                shutil.rmtree(parts_dir)
+            else:
+                self._merge_parts(parts_dir, n_chunks, output_path, fmt)
+
+            elapsed = time.perf_counter() - start
+            rows_per_sec = scored_rows / elapsed if elapsed > 0 else 0.0
+
+            logging.info(f"Batch prediction completed: {scored_rows} rows scored in {elapsed:.2f}s "
+                         f"({rows_per_sec:,.0f} rows/sec), {skipped_chunks} chunks resumed")
+
+            return {
+                "output_path": output_path,
+                "chunks": n_chunks,
+                "resumed_chunks": skipped_chunks,
+                "rows": scored_rows,
+                "seconds": elapsed,
+                "rows_per_sec": rows_per_sec,
+            }
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Score a CSV/Parquet file of projects in parallel")
+    parser.add_argument("input_path")
+    parser.add_argument("output_path")
+    parser.add_argument("--chunk-size", type=int, default=BatchPredictionConfig.chunk_size)
+    parser.add_argument("--workers", type=int, default=BatchPredictionConfig.n_workers)
+    parser.add_argument("--model", default=BatchPredictionConfig.model_file_path)
+    parser.add_argument("--preprocessor", default=BatchPredictionConfig.preprocessor_file_path)
+    parser.add_argument("--predictions-only", action="store_true",
+                        help="write only the prediction column instead of the input rows plus prediction")
+    args = parser.parse_args()
+
+    config = BatchPredictionConfig(
+        model_file_path=args.model,
+        preprocessor_file_path=args.preprocessor,
+        chunk_size=args.chunk_size,
+        n_workers=args.workers,
+        include_input=not args.predictions_only,
+    )
+    summary = BatchPredictPipeline(config).initiate_batch_prediction(args.input_path, args.output_path)
+    print(f"Scored {summary['rows']} rows in {summary['seconds']:.2f}s "
+          f"({summary['rows_per_sec']:,.0f} rows/sec)")
@@ -1,77 +1,71 @@
+import os
 import sys
+import numpy as np
 import pandas as pd
-from src.mlproject.pipelines.predict_pipeline import CustomData,PredictPipeline
-from sklearn.preprocessing import StandardScaler
+from src.mlproject.exception import CustomException
+from src.mlproject.utlis import load_object
+from src.mlproject.concurrency import predict_limited
+from src.mlproject.schema import FEATURE_COLUMNS, FORM_FIELDS, decode_frame, decode_records, preprocessor_input
 
 
 class PredictPipeline:
     def __init__(self):
-        pass
+        self.model_path=os.path.join("artifacts","model.pkl")
+        self.preprocessor_path=os.path.join('artifacts','preprocessor.pkl')
+        self.model=None
+        self.preprocessor=None
+
+    def load(self):
+        # Artifacts are loaded once per pipeline instance, not once per call
+        if self.model is None or self.preprocessor is None:
+            self.model=load_object(file_path=self.model_path)
+            self.preprocessor=load_object(file_path=self.preprocessor_path)
+        return self
 
     def predict(self,features):
         try:
-            model_path=os.path.join("artifacts","model.pkl")
-            preprocessor_path=os.path.join('artifacts','preprocessor.pkl')
-            print("Before Loading")
-            model=load_object(file_path=model_path)
-            preprocessor=load_object(file_path=preprocessor_path)
-            print("After Loading")
-            data_scaled=preprocessor.transform(features)
-            preds=model.predict(data_scaled)
+            self.load()
+            # features is a canonical-order batch from schema.decode_*; DataFrames are decoded first
+            if not isinstance(features, np.ndarray):
+                features=decode_frame(features, allow_missing=True)
+            data_scaled=self.preprocessor.transform(preprocessor_input(self.preprocessor, features))
+            preds=predict_limited(self.model, data_scaled)
             return preds
         
         except Exception as e:
             raise CustomException(e,sys)
 
 
-
-import pandas as pd
-import sys
-from src.mlproject.exception import CustomException
-
 class CustomData:
     def __init__(
         self,
-        labor_requirements,
-        equipment_usage,
-        material_quantities,
-        project_duration,
-        schedule_optimization,
-        computation_time,
-        best_cost,
-        evaluation_metric,
-        mean_resource_demand,
-        sd_resource_demand
-        # 🚫 Risk Level is missing!
+        labor,
+        equipment,
+        material,
+        duration,
+        schedule_opt,
+        comp_time,
+        cost,
+        metric,
+        mean_demand,
+        sd_demand,
+        risk_level=None
     ):
-        self.labor_requirements = labor_requirements
-        self.equipment_usage = equipment_usage
-        self.material_quantities = material_quantities
-        self.project_duration = project_duration
-        self.schedule_optimization = schedule_optimization
-        self.computation_time = computation_time
-        self.best_cost = best_cost
-        self.evaluation_metric = evaluation_metric
-        self.mean_resource_demand = mean_resource_demand
-        self.sd_resource_demand = sd_resource_demand
-        # 🚫 self.risk_level is not declared
+        # Argument names are the schema's form fields, so the row decodes in canonical order;
+        # risk_level is optional (it is predicted, not a model input)
+        self.values = dict(zip(FORM_FIELDS, (
+            labor, equipment, material, duration, schedule_opt, comp_time,
+            cost, metric, mean_demand, sd_demand, risk_level,
+        )))
 
-    def get_data_as_data_frame(self):
+    def get_data_as_array(self, dtype=np.float64):
         try:
-            data_dict = {
-                "Labor Requirements": [self.labor_requirements],
-                "Equipment Usage": [self.equipment_usage],
-                "Material Quantities": [self.material_quantities],
-                "Project Duration (days)": [self.project_duration],
-                "Schedule Optimization": [self.schedule_optimization],
-                "Computation Time (CT)": [self.computation_time],
-                "Best Cost (BC)": [self.best_cost],
-                "Evaluation Metric (Nfe)": [self.evaluation_metric],
-                "Mean Resource Demand": [self.mean_resource_demand],
-                "SD of Resource Demand": [self.sd_resource_demand]
-                # 🚫 "Risk Level" is missing here too
-            }
-            return pd.DataFrame(data_dict)
+            return decode_records([self.values], dtype=dtype)
         except Exception as e:
             raise CustomException(e, sys)
 
+    def get_data_as_data_frame(self):
+        try:
+            return pd.DataFrame(self.get_data_as_array(), columns=FEATURE_COLUMNS)
+        except Exception as e:
+            raise CustomException(e, sys)
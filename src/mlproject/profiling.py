@@ -0,0 +1,128 @@
+import os
+import sys
+import time
+import cProfile
+import threading
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+
+from src.mlproject.exception import CustomException
+from src.mlproject.logger import logging
+
+
+def _frame_label(frame):
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def sample_stacks(seconds, interval=0.005):
+    '''
+    Statistical profiler: samples the stack of every other thread each
+    `interval` seconds for `seconds` seconds and returns them in collapsed
+    format ("root;...;leaf count" per line), ready for flamegraph.pl or
+    speedscope.
+    '''
+    try:
+        own_thread = threading.get_ident()
+        thread_names = {thread.ident: thread.name for thread in threading.enumerate()}
+        counts = Counter()
+        deadline = time.perf_counter() + seconds
+
+        while time.perf_counter() < deadline:
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_thread:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_label(frame))
+                    frame = frame.f_back
+                stack.append(thread_names.get(thread_id, f"thread-{thread_id}"))
+                counts[";".join(reversed(stack))] += 1
+            time.sleep(interval)
+
+        return "\n".join(f"{stack} {count}" for stack, count in counts.most_common()) + "\n"
+
+    except Exception as e:
+        raise CustomException(e, sys)
+
+
+class TrainingProfiler:
+    '''
+    Records one cProfile dump and one tracemalloc report per stage. Stages
+    may nest; a parent's profile is paused while a child stage runs, so each
+    dump only covers time not attributed to a nested stage.
+    '''
+
+    def __init__(self, output_dir, top_allocations=25):
+        self.output_dir = output_dir
+        self.top_allocations = top_allocations
+        self._stack = []
+        self._n_stages = 0
+        os.makedirs(self.output_dir, exist_ok=True)
+
+    def _file_name(self, name):
+        return "".join(c if c.isalnum() or c in "-_." else "_" for c in name)
+
+    @contextmanager
+    def stage(self, name):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        if self._stack:
+            self._stack[-1][0].disable()
+            # reset_peak() below would drop the parent's peak so far; keep it
+            self._stack[-1][1] = max(self._stack[-1][1], tracemalloc.get_traced_memory()[1])
+
+        profile = cProfile.Profile()
+        # [profile, highest peak seen in nested stages]; a nested stage resets
+        # the tracemalloc peak, so it hands its own peak back to the parent
+        self._stack.append([profile, 0])
+        snapshot_before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        start = time.perf_counter()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            elapsed = time.perf_counter() - start
+            _, peak = tracemalloc.get_traced_memory()
+            peak = max(peak, self._stack.pop()[1])
+            snapshot_after = tracemalloc.take_snapshot()
+
+            # Numbered by completion order so repeated stage names never collide
+            self._n_stages += 1
+            file_name = f"{self._n_stages:03d}_{self._file_name(name)}"
+            profile.dump_stats(os.path.join(self.output_dir, f"{file_name}.prof"))
+            with open(os.path.join(self.output_dir, f"{file_name}.tracemalloc.txt"), "w") as report:
+                report.write(f"stage: {name}\nseconds: {elapsed:.3f}\npeak traced memory: {peak / 1024 ** 2:.1f} MiB\n\n")
+                for stat in snapshot_after.compare_to(snapshot_before, "lineno")[:self.top_allocations]:
+                    report.write(f"{stat}\n")
+
+            logging.info(f"Profiled stage {name}: {elapsed:.3f}s, peak traced memory {peak / 1024 ** 2:.1f} MiB")
+
+            if self._stack:
+                self._stack[-1][1] = max(self._stack[-1][1], peak)
+                self._stack[-1][0].enable()
+
+
+# Set only by enable_training_profiler(); while it is None, profile_stage()
+# returns a shared no-op context and nothing is traced
+_training_profiler = None
+_NULL_STAGE = nullcontext()
+
+
+def enable_training_profiler(output_dir):
+    global _training_profiler
+    _training_profiler = TrainingProfiler(output_dir)
+    return _training_profiler
+
+
+def training_profiler_enabled():
+    return _training_profiler is not None
+
+
+def profile_stage(name):
+    if _training_profiler is None:
+        return _NULL_STAGE
+    return _training_profiler.stage(name)
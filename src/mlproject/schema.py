@@ -0,0 +1,293 @@
+import io
+import csv
+import sys
+from dataclasses import dataclass
+
+import numpy as np
+
+from src.mlproject.exception import CustomException
+
+
+@dataclass(frozen=True)
+class Feature:
+    name: str
+    form_field: str
+    low: float = 0.0
+    high: float = np.inf
+    # Counts and category codes are integer-valued; batches are still float
+    dtype: type = np.float64
+    # Optional columns may be absent or blank in any input and decode to NaN
+    required: bool = True
+
+    @property
+    def integer(self):
+        return np.issubdtype(self.dtype, np.integer)
+
+
+# Canonical column order for every request, batch file and training matrix
+FEATURES = (
+    Feature("Labor Requirements", "labor", dtype=np.int64),
+    Feature("Equipment Usage", "equipment", dtype=np.int64),
+    Feature("Material Quantities", "material"),
+    Feature("Project Duration (days)", "duration", dtype=np.int64),
+    Feature("Schedule Optimization", "schedule_opt", 0.0, 1.0, dtype=np.int64),
+    Feature("Computation Time (CT)", "comp_time"),
+    Feature("Best Cost (BC)", "cost"),
+    Feature("Evaluation Metric (Nfe)", "metric", dtype=np.int64),
+    Feature("Mean Resource Demand", "mean_demand"),
+    Feature("SD of Resource Demand", "sd_demand"),
+    # Predicted by the risk model and never a model input; present in the
+    # training data, optional everywhere else
+    Feature("Risk Level", "risk_level", 0.0, 2.0, dtype=np.int64, required=False),
+)
+
+FEATURE_COLUMNS = [feature.name for feature in FEATURES]
+FORM_FIELDS = [feature.form_field for feature in FEATURES]
+FEATURES_BY_NAME = {feature.name: feature for feature in FEATURES}
+
+TARGET_COLUMN = "Resource Allocation Efficiency"
+RISK_TARGET_COLUMN = "Risk Level"
+
+# ✅ "Risk Level" is an input column but not a model feature
+NUMERICAL_COLUMNS = [column for column in FEATURE_COLUMNS if column != RISK_TARGET_COLUMN]
+NUMERICAL_INDICES = [FEATURE_COLUMNS.index(column) for column in NUMERICAL_COLUMNS]
+
+LOWER_BOUNDS = np.array([feature.low for feature in FEATURES])
+UPPER_BOUNDS = np.array([feature.high for feature in FEATURES])
+INTEGER_MASK = np.array([feature.integer for feature in FEATURES])
+REQUIRED_MASK = np.array([feature.required for feature in FEATURES])
+
+# Either the form field ("labor") or the column name is accepted as a key
+_KEY_INDEX = {}
+for _i, _feature in enumerate(FEATURES):
+    _KEY_INDEX[_feature.form_field] = _i
+    _KEY_INDEX[_feature.name] = _i
+
+
+class SchemaValidationError(ValueError):
+    pass
+
+
+def _buffer(n_rows, dtype, out):
+    if out is None:
+        return np.empty((n_rows, len(FEATURES)), dtype=dtype)
+    if out.shape != (n_rows, len(FEATURES)):
+        raise SchemaValidationError(f"Buffer has shape {out.shape}, expected {(n_rows, len(FEATURES))}")
+    return out
+
+
+def validate(batch, allow_missing=False):
+    '''
+    Vectorized check of a (n_rows, n_features) batch against the bounds
+    and, for integer features, integrality. NaN is accepted only with
+    allow_missing (the preprocessor imputes it), and always for optional
+    columns.
+    '''
+    missing = np.isnan(batch)
+    with np.errstate(invalid="ignore"):
+        invalid = (batch < LOWER_BOUNDS) | (batch > UPPER_BOUNDS) | np.isinf(batch)
+        invalid |= INTEGER_MASK & ~missing & (batch != np.floor(batch))
+    if not allow_missing:
+        invalid |= missing & REQUIRED_MASK
+
+    if invalid.any():
+        rows, cols = np.nonzero(invalid)
+        details = ", ".join(
+            f"row {row} {FEATURE_COLUMNS[col]}={float(batch[row, col])!r}" for row, col in zip(rows[:5], cols[:5])
+        )
+        raise SchemaValidationError(f"{len(rows)} invalid values: {details}")
+
+    return batch
+
+
+def _decode_record(batch, row, record):
+    if not hasattr(record, "items"):
+        raise SchemaValidationError(f"row {row} is not an object: {record!r}")
+    found = np.zeros(len(FEATURES), dtype=bool)
+    for key, value in record.items():
+        col = _KEY_INDEX.get(key)
+        if col is None:
+            continue
+        try:
+            batch[row, col] = np.nan if value is None or value == "" else float(value)
+        except (TypeError, ValueError):
+            raise SchemaValidationError(f"row {row} {FEATURE_COLUMNS[col]}: {value!r} is not a number")
+        found[col] = True
+    if not found[REQUIRED_MASK].all():
+        missing = [FEATURE_COLUMNS[col] for col in np.flatnonzero(~found & REQUIRED_MASK)]
+        raise SchemaValidationError(f"row {row} is missing {missing}")
+    batch[row, ~found] = np.nan
+
+
+def _optional_value(record, feature):
+    value = record.get(feature.form_field, record.get(feature.name))
+    return np.nan if value is None or value == "" else float(value)
+
+
+def _record_keys(record):
+    # The key used for each canonical column, or None if the record lacks one
+    try:
+        return [
+            next((key for key in (feature.form_field, feature.name) if key in record), None)
+            for feature in FEATURES
+        ]
+    except TypeError:
+        return None
+
+
+def decode_records(records, dtype=np.float64, out=None, allow_missing=False):
+    '''
+    Decodes a sequence of mappings (form data, JSON objects) keyed by form
+    field or column name into a batch in canonical column order.
+    '''
+    if not len(records):
+        raise SchemaValidationError("No rows to decode")
+    batch = _buffer(len(records), dtype, out)
+
+    # Fast path: records keyed like the first one are filled column by column;
+    # anything else (missing keys, blanks, bad values) is redone row by row
+    # so the error names the offending row and column
+    keys = _record_keys(records[0])
+    if keys is not None and all(key is not None for key, required in zip(keys, REQUIRED_MASK) if required):
+        try:
+            for col, (key, feature) in enumerate(zip(keys, FEATURES)):
+                if feature.required:
+                    batch[:, col] = [float(record[key]) for record in records]
+                else:
+                    batch[:, col] = [_optional_value(record, feature) for record in records]
+            return validate(batch, allow_missing)
+        except (KeyError, TypeError, ValueError, AttributeError):
+            pass
+
+    for row, record in enumerate(records):
+        _decode_record(batch, row, record)
+
+    return validate(batch, allow_missing)
+
+
+def decode_form(form, dtype=np.float64, out=None):
+    '''
+    Decodes one HTML form submission into a (1, n_features) row.
+    '''
+    return decode_records([form], dtype=dtype, out=out)
+
+
+def decode_json(payload, dtype=np.float64, out=None):
+    '''
+    Decodes a JSON object (one row) or a list of objects (a batch).
+    '''
+    records = [payload] if isinstance(payload, dict) else payload
+    if not isinstance(records, list):
+        raise SchemaValidationError(f"Expected an object or a list of objects, got {type(payload).__name__}")
+    return decode_records(records, dtype=dtype, out=out)
+
+
+def _column_positions(header):
+    # Header position of each canonical column; None for absent optional ones
+    positions = []
+    for feature in FEATURES:
+        for key in (feature.name, feature.form_field):
+            if key in header:
+                positions.append(header.index(key))
+                break
+        else:
+            if feature.required:
+                raise SchemaValidationError(f"CSV header is missing {feature.name!r}")
+            positions.append(None)
+    return positions
+
+
+# Above this many characters pandas' C parser beats np.loadtxt; below it
+# read_csv's fixed per-call overhead dominates
+_LOADTXT_MAX_CHARS = 64 * 1024
+
+
+def _parse_field(field):
+    # Blank fields are missing values, as in the pandas path
+    field = field.strip()
+    return float(field) if field else np.nan
+
+
+def decode_csv(text, dtype=np.float64, out=None, allow_missing=False):
+    '''
+    Parses CSV text with a header row into a batch, reading only the feature
+    columns and reordering them into canonical order. Blank fields decode to
+    NaN and are accepted only with allow_missing.
+    '''
+    lines = io.StringIO(text)
+    header = [name.strip() for name in next(csv.reader(lines), [])]
+    positions = _column_positions(header)
+    present = [col for col, position in enumerate(positions) if position is not None]
+    positions = [positions[col] for col in present]
+    # Checked up front: np.loadtxt only warns on a header-only body
+    body_start = lines.tell()
+    if not text[body_start:].strip():
+        raise SchemaValidationError("No rows to decode")
+    try:
+        if len(text) <= _LOADTXT_MAX_CHARS:
+            loadtxt_args = dict(delimiter=",", quotechar='"', usecols=positions, dtype=dtype, ndmin=2)
+            try:
+                batch = np.loadtxt(lines, **loadtxt_args)
+            except ValueError:
+                # Blank fields: parse again with the (slower) per-field converter
+                lines.seek(body_start)
+                batch = np.loadtxt(lines, converters=_parse_field, **loadtxt_args)
+        else:
+            import pandas as pd
+
+            # usecols does not reorder in read_csv, so columns are picked by position afterwards
+            frame = pd.read_csv(lines, header=None, usecols=positions, dtype=dtype, engine="c",
+                                keep_default_na=False, na_values=[""])
+            batch = frame[positions].to_numpy(dtype=dtype)
+    except ValueError as e:
+        raise SchemaValidationError(str(e))
+
+    if out is not None or len(present) < len(FEATURES):
+        parsed, batch = batch, _buffer(len(batch), dtype, out)
+        batch[:] = np.nan
+        batch[:, present] = parsed
+    return validate(np.ascontiguousarray(batch), allow_missing)
+
+
+def decode_frame(df, dtype=np.float64, out=None, allow_missing=False):
+    '''
+    Copies the feature columns of a DataFrame (or one row as a Series)
+    column by column into a batch in canonical order.
+    '''
+    try:
+        if getattr(df, "ndim", 2) == 1:
+            df = df.to_frame().T
+        batch = _buffer(len(df), dtype, out)
+        for col, feature in enumerate(FEATURES):
+            if feature.required or feature.name in df:
+                batch[:, col] = df[feature.name].to_numpy(dtype=dtype, na_value=np.nan)
+            else:
+                batch[:, col] = np.nan
+        return validate(batch, allow_missing)
+
+    except KeyError as e:
+        raise SchemaValidationError(f"Missing column {e}")
+
+
+def preprocessor_input(preprocessor, batch):
+    '''
+    Preprocessors fitted on canonical arrays take the batch as is; older
+    ones fitted on a DataFrame get a frame in their fitted column order.
+    '''
+    try:
+        feature_names = getattr(preprocessor, "feature_names_in_", None)
+        if feature_names is None:
+            return batch
+
+        import pandas as pd
+
+        # Columns the schema does not know (e.g. a target the transformer
+        # drops) are passed as NaN
+        frame = pd.DataFrame(np.nan, index=range(len(batch)), columns=list(feature_names))
+        for name in feature_names:
+            if name in _KEY_INDEX:
+                frame[name] = batch[:, _KEY_INDEX[name]]
+        return frame
+
+    except Exception as e:
+        raise CustomException(e, sys)
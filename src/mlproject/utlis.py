@@ -2,13 +2,18 @@ import os
 import sys
 from src.mlproject.exception import CustomException
 from src.mlproject.logger import logging
+from src.mlproject.profiling import profile_stage, training_profiler_enabled
 import pandas as pd
 import pymysql
 from dotenv import load_dotenv
 from sklearn.metrics import r2_score
-from sklearn.model_selection import GridSearchCV
+from sklearn.model_selection import GridSearchCV, ParameterGrid, check_cv
+from joblib import parallel_config, cpu_count
+from threadpoolctl import threadpool_limits
 
 import pickle
+import time
+import hashlib
 import numpy as np
 
 load_dotenv()
@@ -45,31 +50,136 @@ def save_object(file_path, obj):
     except Exception as e:
         raise CustomException(e, sys)
 
-def evaluate_models(X_train, y_train,X_test,y_test,models,param):
+def load_object(file_path):
+    try:
+        with open(file_path, "rb") as file_obj:
+            return pickle.load(file_obj)
+
+    except Exception as e:
+        raise CustomException(e, sys)
+
+def artifact_version(file_path):
+    '''
+    Short content hash of an artifact, used to tag predictions with the model that made them.
+    '''
+    try:
+        with open(file_path, "rb") as file_obj:
+            return hashlib.sha256(file_obj.read()).hexdigest()[:12]
+
+    except Exception as e:
+        raise CustomException(e, sys)
+
+def model_input(X, accepts_float32=False):
+    '''
+    Returns X as a C-contiguous array the estimator can consume without
+    converting it again: float32 is kept for estimators that accept it,
+    everything else gets float64.
+    '''
+    if accepts_float32 and X.dtype == np.float32:
+        return np.ascontiguousarray(X)
+    return np.ascontiguousarray(X, dtype=np.float64)
+
+def thread_budget(n_tasks, n_cpus=None):
+    '''
+    Splits the CPUs between outer parallel tasks (CV fits) and the threads
+    each task may use, so that outer * inner never exceeds the CPU count.
+    joblib's cpu_count honours CPU affinity and cgroup quotas, unlike os.cpu_count.
+    '''
+    n_cpus = n_cpus or cpu_count()
+    outer = max(1, min(n_tasks, n_cpus))
+    inner = max(1, n_cpus // outer)
+    return outer, inner
+
+def evaluate_models(X_train, y_train,X_test,y_test,models,param,float32_models=(),cv=3,scoring=r2_score,
+                    threaded_models=None, inputs=None):
+    '''
+    Grid-searches every model and returns {name: {"score", "fit_seconds",
+    "train_rows_per_sec"}}. threaded_models maps a model name to the
+    parameter controlling its own thread pool (n_jobs, thread_count, ...).
+    inputs caches the (X_train, X_test) model inputs per dtype; pass the
+    same dict to several calls on the same features to share them.
+    '''
     try:
         report = {}
+        threaded_models = threaded_models or {}
+        # float64 copies are built at most once and shared by every model that needs them
+        inputs = {} if inputs is None else inputs
+        n_splits = check_cv(cv).get_n_splits(X_train, y_train)
+        n_cpus = cpu_count()
 
         for i in range(len(list(models))):
             model = list(models.values())[i]
-            para=param[list(models.keys())[i]]
+            name = list(models.keys())[i]
+            para=param[name]
+
+            accepts_float32 = name in float32_models
+            if accepts_float32 not in inputs:
+                inputs[accepts_float32] = (
+                    model_input(X_train, accepts_float32),
+                    model_input(X_test, accepts_float32),
+                )
+            X_train_model, X_test_model = inputs[accepts_float32]
+
+            # Profiled as one stage per candidate when app.py runs with --profile.
+            # cProfile only sees this process, so CV fits then run in-process
+            # (one outer worker) instead of in loky worker processes
+            with profile_stage(f"fit {name}"):
+                # Outer CV workers times library threads must fit in the CPU budget
+                n_tasks = 1 if training_profiler_enabled() else n_splits * len(ParameterGrid(para))
+                outer, inner = thread_budget(n_tasks, n_cpus)
+                thread_param = threaded_models.get(name)
+                if thread_param:
+                    model.set_params(**{thread_param: inner})
+
+                # The best parameters are refit below, so GridSearchCV's own refit is skipped
+                gs = GridSearchCV(model,para,cv=cv,n_jobs=outer,refit=False)
+                if outer > 1:
+                    # Caps BLAS/OpenMP threads inside each loky CV worker
+                    with parallel_config(backend="loky", inner_max_num_threads=inner):
+                        gs.fit(X_train_model,y_train)
+                else:
+                    # In-process CV keeps the estimator's own backend (e.g. RF threads)
+                    with threadpool_limits(inner):
+                        gs.fit(X_train_model,y_train)
+
+                # The refit below is a single task, so it gets every core
+                if thread_param:
+                    model.set_params(**{thread_param: n_cpus})
+                model.set_params(**gs.best_params_)
+                start = time.perf_counter()
+                model.fit(X_train_model,y_train)
+                fit_seconds = time.perf_counter() - start
 
-            gs = GridSearchCV(model,para,cv=3)
-            gs.fit(X_train,y_train)
+            #model.fit(X_train, y_train)  # Train model
 
-            model.set_params(**gs.best_params_)
-            model.fit(X_train,y_train)
+            y_train_pred = model.predict(X_train_model)
 
-            #model.fit(X_train, y_train)  # Train model
+            y_test_pred = model.predict(X_test_model)
 
-            y_train_pred = model.predict(X_train)
+            # The fitted model is pickled and served from request threads and
+            # pool workers, so it must not keep the refit's full-core pool
+            if thread_param:
+                try:
+                    model.set_params(**{thread_param: 1})
+                except Exception:
+                    # CatBoost rejects set_params once fitted, and its predict()
+                    # uses every core regardless; serving code caps it per call
+                    # through concurrency.predict_limited
+                    pass
 
-            y_test_pred = model.predict(X_test)
+            train_model_score = scoring(y_train, y_train_pred)
 
-            train_model_score = r2_score(y_train, y_train_pred)
+            test_model_score = scoring(y_test, y_test_pred)
 
-            test_model_score = r2_score(y_test, y_test_pred)
+            report[name] = {
+                "score": test_model_score,
+                "fit_seconds": fit_seconds,
+                "train_rows_per_sec": len(X_train_model) / fit_seconds if fit_seconds > 0 else float("inf"),
+            }
 
-            report[list(models.keys())[i]] = test_model_score
+            logging.info(f"{name}: {scoring.__name__}={test_model_score:.4f}, "
+                         f"{report[name]['train_rows_per_sec']:,.0f} train rows/sec "
+                         f"(cv workers={outer}, threads per worker={inner})")
 
         return report
 
@@ -0,0 +1,32 @@
+import numpy as np
+
+from src.mlproject.benchmarks import benchmark_training_memory, make_synthetic_dataset
+from src.mlproject.components.data_transformation import DataTransformation, DataTransformationConfig
+
+
+def test_compact_training_has_lower_peak_rss():
+    # Each mode runs in its own spawned process, so the peaks are independent
+    results = benchmark_training_memory(n_rows=200_000, model_names=("Linear Regression", "Decision Tree"))
+
+    assert results["after"]["peak_mb"] < results["before"]["peak_mb"]
+    assert results["after"]["X_train_dtype"] == np.dtype(np.float32).str
+    assert results["after"]["X_train_c_contiguous"]
+
+
+def test_compact_transformation_returns_float32_c_contiguous(tmp_path):
+    df = make_synthetic_dataset(1_000)
+    train_path, test_path = tmp_path / "train.csv", tmp_path / "test.csv"
+    df.iloc[:800].to_csv(train_path, index=False)
+    df.iloc[800:].to_csv(test_path, index=False)
+
+    data_transformation = DataTransformation(DataTransformationConfig(
+        preprocessor_obj_file_path=str(tmp_path / "preprocessor.pkl")
+    ))
+    X_train, y_train, X_test, y_test, _ = data_transformation.initiate_compact_data_transformation(
+        str(train_path), str(test_path)
+    )
+
+    for X in (X_train, X_test):
+        assert X.dtype == np.float32
+        assert X.flags.c_contiguous
+    assert y_train.dtype == np.float64
@@ -1,67 +1,199 @@
-from flask import Flask, request, render_template
-import pandas as pd
+from flask import Flask, request, render_template, Response, abort, jsonify
 import pickle
+import os
+import hmac
+import math
+import time
+import threading
+from datetime import datetime
 
-# Flask app initialization
+from src.mlproject.components.multi_target_model import MultiTargetModel
+from src.mlproject.components.resource_optimizer import ResourceOptimizer
+from src.mlproject.components.prediction_store import PredictionStore, PredictionStoreConfig
+from src.mlproject.logger import logging, get_request_logger
+from src.mlproject.utlis import artifact_version
+from src.mlproject.profiling import sample_stacks
+from src.mlproject.schema import (FEATURE_COLUMNS, TARGET_COLUMN, RISK_TARGET_COLUMN, SchemaValidationError,
+                                  decode_form, decode_json, decode_csv)
+
+# Flask app initialization. Artifacts and background services are set up by
+# create_app(), so importing this module (e.g. as __mp_main__ in an optimizer
+# worker) loads nothing and starts no threads
 app = Flask(__name__)
+# Per-request INFO logs go through the queue and are sampled (LOG_REQUEST_SAMPLE_RATE)
+request_logger = get_request_logger()
+
+MULTI_TARGET_MODEL_PATH = os.path.join("artifacts", "multi_target_model.pkl")
+
+# The admin profiling route is disabled unless ADMIN_TOKEN is set
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN")
+MAX_PROFILE_SECONDS = 60
+MIN_PROFILE_SECONDS = 0.1
+MIN_PROFILE_INTERVAL = 0.001
+# /history windows are whole hours, up to a year
+MIN_HISTORY_HOURS = 1
+MAX_HISTORY_HOURS = 24 * 365
+
+# Populated once per serving process by create_app()
+multi_target_model = None
+MODEL_VERSION = None
+prediction_store = None
+resource_optimizer = None
+
+def load_model():
+    # Load the combined efficiency + risk artifact; fall back to the
+    # efficiency-only model/preprocessor pair if it has not been trained yet
+    if os.path.exists(MULTI_TARGET_MODEL_PATH):
+        with open(MULTI_TARGET_MODEL_PATH, "rb") as f:
+            return pickle.load(f), artifact_version(MULTI_TARGET_MODEL_PATH)
+
+    with open("artifacts/model.pkl", "rb") as f:
+        model = pickle.load(f)
+    with open("artifacts/preprocessor.pkl", "rb") as f:
+        preprocessor = pickle.load(f)
+    return MultiTargetModel(preprocessor, {TARGET_COLUMN: model}), artifact_version("artifacts/model.pkl")
+
+def create_app(prediction_store_config: PredictionStoreConfig = None):
+    '''
+    Loads the model once, starts the prediction store and starts the
+    optimizer's worker pool in the background. Call it once per serving
+    process, e.g. gunicorn "yapp:create_app()" or flask --app "yapp:create_app()" run.
+    '''
+    global multi_target_model, MODEL_VERSION, prediction_store, resource_optimizer
 
-# Load model and preprocessor
-with open("artifacts/model.pkl", "rb") as f:
-    model = pickle.load(f)
-with open("artifacts/preprocessor.pkl", "rb") as f:
-    preprocessor = pickle.load(f)
-
-class CustomData:
-    def __init__(self, labor, equipment, material, duration,
-                 schedule_opt, comp_time, cost, metric,
-                 mean_demand, sd_demand, risk_level):
-        self.data = {
-            "Labor Requirements": [float(labor)],
-            "Equipment Usage": [float(equipment)],
-            "Material Quantities": [float(material)],
-            "Project Duration (days)": [float(duration)],
-            "Schedule Optimization": [float(schedule_opt)],
-            "Computation Time (CT)": [float(comp_time)],
-            "Best Cost (BC)": [float(cost)],
-            "Evaluation Metric (Nfe)": [float(metric)],
-            "Mean Resource Demand": [float(mean_demand)],
-            "SD of Resource Demand": [float(sd_demand)],
-            "Risk Level": [float(risk_level)]
-        }
-
-    def to_dataframe(self):
-        return pd.DataFrame(self.data)
+    if multi_target_model is None:
+        multi_target_model, MODEL_VERSION = load_model()
+        # Request threads only enqueue; the store's writer thread batch-inserts
+        prediction_store = PredictionStore(prediction_store_config).start()
+        # Workers start while the server comes up; an /optimize request that
+        # arrives first waits for them before its search budget starts
+        resource_optimizer = ResourceOptimizer(multi_target_model)
+        threading.Thread(target=resource_optimizer.start, name="optimizer-start", daemon=True).start()
+
+    return app
+
+def row_to_dict(row):
+    # Templates and the prediction store key the inputs by column name;
+    # optional inputs that were not given are None
+    return {column: None if value != value else value for column, value in zip(FEATURE_COLUMNS, row.tolist())}
 
 @app.route("/", methods=["GET", "POST"])
 def index():
     if request.method == "POST":
         try:
-            form_data = request.form
-            data = CustomData(
-                labor=form_data["labor"],
-                equipment=form_data["equipment"],
-                material=form_data["material"],
-                duration=form_data["duration"],
-                schedule_opt=form_data["schedule_opt"],
-                comp_time=form_data["comp_time"],
-                cost=form_data["cost"],
-                metric=form_data["metric"],
-                mean_demand=form_data["mean_demand"],
-                sd_demand=form_data["sd_demand"],
-                risk_level=form_data["risk_level"]
-            )
-            df = data.to_dataframe()
-            scaled = preprocessor.transform(df)
-            prediction = model.predict(scaled)[0]
+            features = decode_form(request.form)
+            predictions = multi_target_model.predict(features)
+            prediction = predictions[TARGET_COLUMN][0]
+            risk_prediction = predictions[RISK_TARGET_COLUMN][0] if RISK_TARGET_COLUMN in predictions else None
+            request_logger.info("Prediction: efficiency=%s risk=%s", prediction, risk_prediction)
+            input_data = row_to_dict(features[0])
+            prediction_store.record(input_data, prediction, risk_prediction, model_version=MODEL_VERSION)
 
             # Pass input and prediction to template
-            return render_template("dashboard.html", prediction=prediction, input_data=df.iloc[0].to_dict())
+            return render_template("dashboard.html", prediction=prediction, risk_prediction=risk_prediction,
+                                   input_data=input_data)
 
         except Exception as e:
-            print(f"Error: {e}")
+            logging.exception(f"Prediction failed: {e}")
             return render_template("dashboard.html", error="Something went wrong.")
 
     return render_template("dashboard.html", prediction=None)
 
+@app.route("/optimize", methods=["GET", "POST"])
+def optimize():
+    if request.method == "POST":
+        try:
+            form_data = request.form
+            labor_bounds = (float(form_data["labor_min"]), float(form_data["labor_max"]))
+            equipment_bounds = (float(form_data["equipment_min"]), float(form_data["equipment_max"]))
+
+            # Labor and equipment start at the (whole-unit) middle of their bounds; the optimizer searches them
+            plan = form_data.to_dict()
+            plan["labor"] = round(sum(labor_bounds) / 2)
+            plan["equipment"] = round(sum(equipment_bounds) / 2)
+            base_plan = row_to_dict(decode_form(plan)[0])
+
+            result = resource_optimizer.optimize(base_plan, {
+                "Labor Requirements": labor_bounds,
+                "Equipment Usage": equipment_bounds,
+            })
+
+            request_logger.info("Optimization: allocation=%s efficiency=%s in %.3fs",
+                                result["allocation"], result["predicted_efficiency"], result["seconds"])
+            return render_template("optimize.html", result=result, input_data=base_plan)
+
+        except Exception as e:
+            logging.exception(f"Optimization failed: {e}")
+            return render_template("optimize.html", result=None, error="Something went wrong.")
+
+    return render_template("optimize.html", result=None)
+
+@app.route("/api/predict", methods=["POST"])
+def api_predict():
+    # Accepts one JSON object, a JSON list of objects, or CSV text with a header row
+    try:
+        if request.mimetype == "text/csv":
+            features = decode_csv(request.get_data(as_text=True))
+        else:
+            features = decode_json(request.get_json(force=True))
+    except SchemaValidationError as e:
+        return jsonify(error=str(e)), 400
+
+    predictions = multi_target_model.predict(features)
+    request_logger.info("API prediction: %d rows", len(features))
+    risk_predictions = predictions.get(RISK_TARGET_COLUMN)
+    for i, row in enumerate(features):
+        prediction_store.record(row_to_dict(row), predictions[TARGET_COLUMN][i],
+                                None if risk_predictions is None else risk_predictions[i],
+                                model_version=MODEL_VERSION)
+    for target, values in predictions.items():
+        predictions[target] = values.tolist()
+    return jsonify(predictions)
+
+@app.route("/history")
+def history():
+    # Charts read the pre-aggregated buckets; only the recent table touches raw rows
+    hours = request.args.get("hours", default=24, type=float)
+    if not math.isfinite(hours):
+        abort(400)
+    hours = min(max(hours, MIN_HISTORY_HOURS), MAX_HISTORY_HOURS)
+    since = time.time() - hours * 3600
+    model_version = request.args.get("model_version") or None
+
+    buckets = prediction_store.aggregates(since=since, model_version=model_version)
+    for bucket in buckets:
+        bucket["label"] = datetime.fromtimestamp(bucket["bucket_start"]).strftime("%Y-%m-%d %H:%M")
+    recent = prediction_store.history(since=since, model_version=model_version, limit=50)
+    for row in recent:
+        row["time"] = datetime.fromtimestamp(row["ts"]).strftime("%Y-%m-%d %H:%M:%S")
+
+    return render_template("history.html", buckets=buckets, recent=recent, hours=hours,
+                           model_version=model_version, current_version=MODEL_VERSION)
+
+@app.route("/admin/profile")
+def admin_profile():
+    # Samples every thread of this process for N seconds and returns a collapsed-stack file
+    token = request.headers.get("X-Admin-Token", "")
+    # compare_digest only accepts ASCII str, so both sides are compared as bytes;
+    # WSGI decodes header bytes as latin-1, which recovers them losslessly
+    if not ADMIN_TOKEN or not hmac.compare_digest(token.encode("latin-1"), ADMIN_TOKEN.encode("utf-8")):
+        abort(403)
+
+    seconds = request.args.get("seconds", default=10, type=float)
+    interval = request.args.get("interval", default=0.005, type=float)
+    if not (math.isfinite(seconds) and math.isfinite(interval)):
+        abort(400)
+    # A zero interval would spin against request threads for the GIL
+    seconds = min(max(seconds, MIN_PROFILE_SECONDS), MAX_PROFILE_SECONDS)
+    interval = min(max(interval, MIN_PROFILE_INTERVAL), seconds)
+    logging.info(f"Profiling requested for {seconds}s")
+
+    return Response(sample_stacks(seconds, interval), mimetype="text/plain",
+                    headers={"Content-Disposition": "attachment; filename=yapp.collapsed"})
+
 if __name__ == "__main__":
+    # The debug reloader serves from a child process (WERKZEUG_RUN_MAIN set);
+    # the parent only watches files, so it loads nothing
+    if os.environ.get("WERKZEUG_RUN_MAIN") == "true":
+        create_app()
     app.run(debug=True)